@@ -1,14 +1,6 @@
-import os
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config
-from sqlalchemy import pool
-
 from alembic import context
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -21,20 +13,12 @@ if config.config_file_name is not None:
 
 # add your model's MetaData object here
 # for 'autogenerate' support
-from models import Base
+from models import Base, DATABASE_URL, engine
 target_metadata = Base.metadata
 
-# Get MySQL database URL from environment variables
-DB_HOST = os.getenv('DB_HOST')
-DB_NAME = os.getenv('DB_NAME')
-DB_USERNAME = os.getenv('DB_USERNAME')
-DB_PWD = os.getenv('DB_PWD')
-DB_PORT = os.getenv('DB_PORT', '3306')
-
-DATABASE_URL = f"mysql+pymysql://{DB_USERNAME}:{DB_PWD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-
-# Set the database URL in the config
-config.set_main_option('sqlalchemy.url', DATABASE_URL)
+# Reuse the application's database URL (models.py loads it from the environment);
+# '%' is escaped so configparser interpolation leaves URL-encoded passwords alone
+config.set_main_option('sqlalchemy.url', DATABASE_URL.replace('%', '%%'))
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -69,19 +53,15 @@ def run_migrations_offline() -> None:
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode.
 
-    In this scenario we need to create an Engine
-    and associate a connection with the context.
+    In this scenario we reuse the application's pooled Engine
+    from models.py and associate a connection with the context.
 
     """
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
-
-    with connectable.connect() as connection:
+    with engine.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            # SQLite can't ALTER most things in place; batch mode copies the table
+            render_as_batch=connection.dialect.name == 'sqlite'
         )
 
         with context.begin_transaction():
@@ -0,0 +1,29 @@
+"""drop the submissions submitted/date index
+
+Revision ID: 0b12cce3a2c7
+Revises: 8466fb5cb084
+Create Date: 2026-10-18 16:41:52.208317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b12cce3a2c7'
+down_revision: Union[str, Sequence[str], None] = '8466fb5cb084'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The dashboard reads poll_daily_summary now, so nothing uses this index
+    op.drop_index('ix_submissions_submitted_date', table_name='submissions')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_submissions_submitted_date', 'submissions',
+                    ['submitted', 'submission_date'], unique=False)
@@ -21,12 +21,15 @@ depends_on: Union[str, Sequence[str], None] = None
 def upgrade() -> None:
     """Upgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    op.add_column('users', sa.Column('emp_name', sa.String(length=255), nullable=False))
+    # batch mode so SQLite can add the NOT NULL column (plain ALTER on MySQL)
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('emp_name', sa.String(length=255), nullable=False))
     # ### end Alembic commands ###
 
 
 def downgrade() -> None:
     """Downgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_column('users', 'emp_name')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('emp_name')
     # ### end Alembic commands ###
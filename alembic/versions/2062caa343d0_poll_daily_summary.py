@@ -0,0 +1,41 @@
+"""add poll daily summary rollup
+
+Revision ID: 2062caa343d0
+Revises: e5e7e64f7360
+Create Date: 2026-10-18 10:41:52.330918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2062caa343d0'
+down_revision: Union[str, Sequence[str], None] = 'e5e7e64f7360'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('poll_daily_summary',
+    sa.Column('summary_date', sa.Date(), nullable=False),
+    sa.Column('submitted_count', sa.Integer(), nullable=False),
+    sa.Column('roster_size', sa.Integer(), nullable=True),
+    sa.Column('poll_end_time', sa.String(length=5), nullable=True),
+    sa.Column('finalized', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('summary_date')
+    )
+    # Backfill from the raw rows that are still around
+    op.execute(
+        "INSERT INTO poll_daily_summary (summary_date, submitted_count, finalized) "
+        "SELECT submission_date, COUNT(id), 0 FROM submissions "
+        "WHERE submitted = 1 GROUP BY submission_date"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('poll_daily_summary')
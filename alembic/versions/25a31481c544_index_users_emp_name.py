@@ -0,0 +1,28 @@
+"""index users by employee name
+
+Revision ID: 25a31481c544
+Revises: 0b12cce3a2c7
+Create Date: 2026-10-18 17:05:36.914072
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '25a31481c544'
+down_revision: Union[str, Sequence[str], None] = '0b12cce3a2c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves the name prefix search in the user lists (emp_name LIKE 'abc%')
+    op.create_index('ix_users_emp_name', 'users', ['emp_name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_emp_name', table_name='users')
@@ -0,0 +1,31 @@
+"""add poll_state settings version
+
+Revision ID: 8466fb5cb084
+Revises: aee2b5836eae
+Create Date: 2026-10-18 13:22:09.540117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8466fb5cb084'
+down_revision: Union[str, Sequence[str], None] = 'aee2b5836eae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('poll_state') as batch_op:
+        batch_op.add_column(sa.Column('settings_version', sa.BigInteger(),
+                                      nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('poll_state') as batch_op:
+        batch_op.drop_column('settings_version')
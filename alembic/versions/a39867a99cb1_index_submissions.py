@@ -0,0 +1,38 @@
+"""index submissions by user and date
+
+Revision ID: a39867a99cb1
+Revises: 10aef95f1635
+Create Date: 2026-10-18 09:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a39867a99cb1'
+down_revision: Union[str, Sequence[str], None] = '10aef95f1635'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the oldest row of any duplicated (user_id, submission_date) pair so
+    # the unique index can be created
+    op.execute(
+        "DELETE FROM submissions WHERE id NOT IN ("
+        "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM submissions "
+        "GROUP BY user_id, submission_date) AS keep_rows)"
+    )
+    op.create_index('uq_submissions_user_date', 'submissions',
+                    ['user_id', 'submission_date'], unique=True)
+    op.create_index('ix_submissions_submission_date', 'submissions',
+                    ['submission_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_submissions_submission_date', table_name='submissions')
+    op.drop_index('uq_submissions_user_date', table_name='submissions')
@@ -0,0 +1,33 @@
+"""add poll_state data version row
+
+Revision ID: aee2b5836eae
+Revises: 2062caa343d0
+Create Date: 2026-10-18 12:05:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'aee2b5836eae'
+down_revision: Union[str, Sequence[str], None] = '2062caa343d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('poll_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('data_version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO poll_state (id, data_version) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('poll_state')
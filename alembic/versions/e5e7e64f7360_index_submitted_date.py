@@ -0,0 +1,29 @@
+"""index submissions by submitted flag and date
+
+Revision ID: e5e7e64f7360
+Revises: a39867a99cb1
+Create Date: 2026-10-18 10:03:17.581240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5e7e64f7360'
+down_revision: Union[str, Sequence[str], None] = 'a39867a99cb1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Covers the dashboard aggregate (filter on submitted, count/distinct on date)
+    op.create_index('ix_submissions_submitted_date', 'submissions',
+                    ['submitted', 'submission_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_submissions_submitted_date', table_name='submissions')
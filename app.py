@@ -1,3 +1,7 @@
+import functools
+import html
+import os
+import tempfile
 from datetime import datetime
 import pytz
 import streamlit as st
@@ -5,22 +9,21 @@ import streamlit.components.v1 as components
 import pandas as pd
 import plotly.graph_objects as go
 from database import (
-    init_db, get_users, get_user_submission_status, submit_poll, get_ist_date, add_user,
-    get_poll_stats, end_poll, remove_user, is_poll_time_active, get_admin_password,
+    init_db, get_submission_status_map, get_ist_date, add_user,
+    get_user_status_page, count_user_status, USER_PAGE_SIZE, end_poll, remove_user, is_poll_time_active, get_admin_password,
     update_admin_password, get_poll_end_time, extend_poll, reset_poll_time,
     is_poll_manually_ended, set_poll_manually_ended, bulk_add_users, reset_poll_submissions,
-    reset_user_submission, get_poll_history, get_user_submission_history, export_poll_data,
-    get_admin_dashboard_stats, get_user_by_emp_id
+    reset_user_submission, get_poll_history, get_user_submission_history, export_poll_range,
+    get_admin_dashboard_stats, get_user_by_emp_id, get_poll_settings, get_data_version,
+    open_rerun_session, close_rerun_session, rerun_session, compute_roster_diff, apply_roster_diff
 )
-from alembic.config import Config
-from alembic import command
+from models import warm_up_pool, DB_POOL_WARMUP
+import assets
+import query_stats
+import profiler
+import write_queue
 import time
 
-
-def run_migrations():
-    alembic_cfg = Config("alembic.ini")
-    command.upgrade(alembic_cfg, "head")
-
 # Page configuration
 st.set_page_config(
     page_title="Dinner Polling System",
@@ -29,13 +32,35 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Opt-in section timing for this rerun (PROFILE_RERUNS=1 or ?profile=1)
+profiler.begin_rerun(enabled=st.query_params.get("profile") == "1")
+profiler.mark("startup")
+
+
+# Seconds between checks for a changed poll deadline while the User view is open
+TIMER_CHECK_SECONDS = int(os.getenv('TIMER_CHECK_SECONDS', '10'))
+
+
+# Minified CSS/JS, read once per process and shared by every session
+@st.cache_resource(show_spinner=False)
+def static_assets():
+    return assets.load_assets()
+
+
+# Just the PollTimer class, inlined into the timer component (see load_css for why)
+@st.cache_resource(show_spinner=False)
+def poll_timer_source():
+    source = static_assets().get('timer_js')
+    return assets.js_class(source, 'PollTimer') if source else None
+
 
-# Load custom CSS
+# Load custom CSS; inlined because Streamlit serves static .css as text/plain,
+# which browsers refuse to apply, and fragment reruns do not resend it
 def load_css():
-    try:
-        with open('static/css/modern_style.css') as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-    except FileNotFoundError:
+    css = static_assets().get('css')
+    if css:
+        st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
+    else:
         # Fallback inline CSS if file not found - simplified version
         st.markdown(
             """
@@ -73,10 +98,60 @@ def load_css():
         )
 
 
-# Initialize database
-init_db()
+# Seconds between User view status checks; a check is one poll_state read
+# unless the data version has moved since the last one
+STATUS_REFRESH_SECONDS = int(os.getenv('STATUS_REFRESH_SECONDS', '5'))
+
+
+# Initialize database once per process; Streamlit reruns reuse the cached result
+@st.cache_resource(show_spinner=False)
+def startup():
+    started = time.perf_counter()
+    init_db(migrate=os.getenv('SKIP_STARTUP_MIGRATIONS', '0') != '1')
+    if DB_POOL_WARMUP:
+        warm_up_pool(DB_POOL_WARMUP)
+    elapsed = time.perf_counter() - started
+    print(f"Startup completed in {elapsed * 1000:.1f} ms")
+    return {'startup_seconds': elapsed}
+
+
+startup_info = startup()
+
+# One database session for the whole rerun; released by stop()/rerun() or at the end of the script.
+# An exception or st.rerun() from inside a widget callback can skip that, so start from a new one
+open_rerun_session(fresh=True)
+query_stats.begin_rerun()
+
+
+def end_of_rerun():
+    close_rerun_session()
+    query_stats.end_rerun()
+    profiler.end_rerun()
+
+
+def stop():
+    end_of_rerun()
+    st.stop()
+
+
+def fragment_scope(label):
+    """Give a fragment's own reruns the same shared session and SQL stats as a full rerun"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with rerun_session(), query_stats.rerun_scope(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def rerun():
+    end_of_rerun()
+    st.rerun()
+
 
 # Load CSS styles
+profiler.mark("css")
 load_css()
 
 # Initialize session state
@@ -91,8 +166,7 @@ if 'last_timer_update' not in st.session_state:
 def get_timer_info():
     ist_tz = pytz.timezone('Asia/Kolkata')
     current_time = datetime.now(ist_tz)
-    poll_end_time_str = get_poll_end_time()
-    poll_end_time = datetime.strptime(poll_end_time_str, '%H:%M').time()
+    poll_end_time = get_poll_settings().deadline
     poll_end_datetime = datetime.combine(current_time.date(), poll_end_time)
     poll_end_datetime = ist_tz.localize(poll_end_datetime)
     time_remaining = poll_end_datetime - current_time
@@ -106,12 +180,77 @@ def get_timer_info():
         return 0, 0, 0, 0, True
 
 
+def paged_user_list(key, date_str, status=None, search=''):
+    """Fetch the current page of a searchable user list and draw its Prev/Next
+    controls; returns [(emp_id, emp_name, submitted)] for that page only"""
+    state = st.session_state.setdefault(f"{key}_pages", {'filters': None, 'cursors': [None]})
+    filters = (str(date_str), status, search.strip())
+    if state['filters'] != filters:
+        # New filters start again from the first page
+        state['filters'] = filters
+        state['cursors'] = [None]
+    cursors = state['cursors']
+    rows, has_more = get_user_status_page(date_str, status, search, after_emp_id=cursors[-1])
+    total = count_user_status(date_str, status, search)
+    start = (len(cursors) - 1) * USER_PAGE_SIZE
+
+    col1, col2, col3 = st.columns([1, 3, 1])
+    with col1:
+        st.button("◀ Prev", key=f"{key}_prev", disabled=len(cursors) == 1,
+                  on_click=cursors.pop)
+    with col2:
+        st.caption(f"Showing {start + 1}–{start + len(rows)} of {total}" if rows
+                   else "No matching users")
+    with col3:
+        st.button("Next ▶", key=f"{key}_next", disabled=not has_more,
+                  on_click=cursors.append, args=(rows[-1][0] if rows else None,))
+    return rows
+
+
+# Column headers accepted in HR roster exports (compared lower-cased, without spaces/underscores)
+ROSTER_ID_COLUMNS = ('empid', 'employeeid', 'id')
+ROSTER_NAME_COLUMNS = ('empname', 'employeename', 'name')
+
+
+def parse_roster_file(uploaded_file):
+    """Read an HR CSV/XLSX export into {emp_id: emp_name}, streaming CSVs in chunks"""
+    if uploaded_file.name.lower().endswith(('.xlsx', '.xls')):
+        chunks = [pd.read_excel(uploaded_file, dtype=str)]
+    else:
+        chunks = pd.read_csv(uploaded_file, dtype=str, chunksize=10000)
+
+    roster = {}
+    errors = []
+    for chunk in chunks:
+        columns = {c.lower().replace(' ', '').replace('_', ''): c for c in chunk.columns}
+        id_col = next((columns[c] for c in ROSTER_ID_COLUMNS if c in columns), None)
+        name_col = next((columns[c] for c in ROSTER_NAME_COLUMNS if c in columns), None)
+        if id_col is None or name_col is None:
+            return {}, ["File needs an employee ID column and an employee name column"]
+        for emp_id_str, emp_name in zip(chunk[id_col], chunk[name_col]):
+            emp_name = emp_name.strip() if isinstance(emp_name, str) else ''
+            try:
+                emp_id = int(str(emp_id_str).strip())
+            except ValueError:
+                errors.append(f"{emp_id_str} (invalid ID)")
+                continue
+            if not emp_name:
+                errors.append(f"{emp_id} (empty name)")
+            elif emp_id in roster:
+                errors.append(f"{emp_id} (duplicate in file)")
+            else:
+                roster[emp_id] = emp_name
+    return roster, errors
+
+
 # Admin panel with session-specific authentication
 admin_mode = st.sidebar.selectbox(
     "🔧 Mode", ["User", "Admin"], help="Switch between User and Admin modes"
 )
+query_stats.label_rerun(admin_mode)
 
 if admin_mode == "Admin":
+    profiler.mark("admin:login")
     st.markdown('<div class="admin-panel">', unsafe_allow_html=True)
     st.title("🔐 Admin Login")
     password = st.text_input("Enter admin password:", type="password",
@@ -142,8 +281,9 @@ if admin_mode == "Admin":
         today = str(ist_today)
 
         # Enhanced Admin Dashboard Stats
+        profiler.mark("admin:dashboard")
         st.subheader("📈 Admin Dashboard Overview")
-        dashboard_stats = get_admin_dashboard_stats()
+        dashboard_stats = get_admin_dashboard_stats(today)
 
         # Enhanced metrics display with responsive admin cards
         col1, col2, col3, col4, col5 = st.columns(5)
@@ -191,6 +331,7 @@ if admin_mode == "Admin":
         st.markdown("---")
 
         # Poll controls
+        profiler.mark("admin:poll_controls")
         st.subheader("📊 Poll Controls")
         hours, minutes, seconds, total_seconds, ended = get_timer_info()
         if not ended:
@@ -203,27 +344,30 @@ if admin_mode == "Admin":
         col1, col2, col3, col4 = st.columns(4)
         with col1:
             if st.button("🛑 End Today's Poll", key="end_poll", help="End poll and clear all submissions"):
+                # Queued submissions would otherwise be written after the clear
+                write_queue.discard_date(today)
                 end_poll(today)
                 st.success("✅ Poll ended and submissions cleared")
-                st.rerun()
+                rerun()
         with col2:
             if st.button("🔄 Reset Poll", key="reset_poll", help="Reset all submissions and reactivate poll"):
+                write_queue.discard_date(today)
                 if reset_poll_submissions(today):
                     st.success(
                         "✅ Poll reset successfully - all submissions cleared")
-                    st.rerun()
+                    rerun()
                 else:
                     st.error("❌ Failed to reset poll")
         with col3:
             if st.button("🔄 Reactivate Poll", key="reactivate_poll", help="Reactivate poll without clearing submissions"):
                 set_poll_manually_ended(False)
                 st.success("✅ Poll reactivated")
-                st.rerun()
+                rerun()
         with col4:
             if st.button("⏰ Reset Time (6:30 PM)", key="reset_time", help="Reset poll end time to default"):
                 reset_poll_time()
                 st.success("✅ Poll time reset to 6:30 PM")
-                st.rerun()
+                rerun()
 
         # Poll extension
         st.subheader("⏱️ Extend Poll Time")
@@ -232,25 +376,26 @@ if admin_mode == "Admin":
             if st.button("⏰ + 30 min", key="extend_30"):
                 new_time = extend_poll(30)
                 st.success(f"✅ Poll extended to {new_time}")
-                st.rerun()
+                rerun()
         with col2:
             if st.button("⏰ + 1 hour", key="extend_60"):
                 new_time = extend_poll(60)
                 st.success(f"✅ Poll extended to {new_time}")
-                st.rerun()
+                rerun()
         with col3:
             if st.button("⏰ + 1.5 hours", key="extend_90"):
                 new_time = extend_poll(90)
                 st.success(f"✅ Poll extended to {new_time}")
-                st.rerun()
+                rerun()
         with col4:
             if st.button("⏰ + 2 hours", key="extend_120"):
                 new_time = extend_poll(120)
                 st.success(f"✅ Poll extended to {new_time}")
-                st.rerun()
+                rerun()
         st.markdown("---")
 
         # User management
+        profiler.mark("admin:user_management")
         st.subheader("👥 User Management")
         # Bulk add users
         with st.expander("📝 Bulk Add Users", expanded=False):
@@ -260,8 +405,8 @@ if admin_mode == "Admin":
                                             height=100, help="Enter employee data in the format ID:Name")
             if st.button("📥 Bulk Add Users", key="bulk_add"):
                 if bulk_users_input.strip():
-                    # Parse input - handle both newline and comma separation
-                    lines = bulk_users_input.replace(',', ' ').split(' ')
+                    # Parse input - handle both newline and comma separation; names may contain spaces
+                    lines = bulk_users_input.replace(',', '\n').splitlines()
                     user_data = []
                     parse_errors = []
                     for line in lines:
@@ -293,9 +438,62 @@ if admin_mode == "Admin":
                         if errors:
                             st.error(f"❌ Failed: {', '.join(errors)}")
                         if added:
-                            st.rerun()
+                            rerun()
+
+        # Roster sync from an HR export
+        with st.expander("🔄 Sync Roster from HR File", expanded=False):
+            st.markdown(
+                "**Format:** CSV or Excel with `Employee ID` and `Employee Name` columns")
+            roster_file = st.file_uploader(
+                "Upload HR export:", type=["csv", "xlsx"], key="roster_file")
+            if roster_file is None:
+                st.session_state.pop('roster_preview', None)
+            else:
+                # Parse and diff an upload once; other widgets' reruns reuse the preview
+                preview = st.session_state.get('roster_preview')
+                if preview is None or preview['file_id'] != roster_file.file_id:
+                    roster, roster_errors = parse_roster_file(roster_file)
+                    preview = {'file_id': roster_file.file_id, 'roster': roster, 'errors': roster_errors,
+                               'diff': compute_roster_diff(roster) if roster else None}
+                    st.session_state.roster_preview = preview
+                roster, roster_errors, diff = preview['roster'], preview['errors'], preview['diff']
+                if roster_errors:
+                    st.error(
+                        f"❌ Skipped rows: {', '.join(roster_errors[:50])}"
+                        f"{' ...' if len(roster_errors) > 50 else ''}")
+                if roster:
+                    apply_removals = st.checkbox(
+                        "Remove employees missing from the file", value=False, key="roster_removals",
+                        help="Leave unchecked when the file only covers part of the organisation")
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("To Add", len(diff.adds))
+                    col2.metric("To Rename", len(diff.renames))
+                    col3.metric("To Remove", len(diff.removals) if apply_removals else 0)
+                    preview_rows = (
+                        [{'Change': 'Add', 'Employee ID': emp_id, 'Employee Name': name}
+                         for emp_id, name in diff.adds[:100]] +
+                        [{'Change': 'Rename', 'Employee ID': emp_id, 'Employee Name': f"{old} → {new}"}
+                         for emp_id, old, new in diff.renames[:100]] +
+                        ([{'Change': 'Remove', 'Employee ID': emp_id, 'Employee Name': name}
+                          for emp_id, name in diff.removals[:100]] if apply_removals else [])
+                    )
+                    if preview_rows:
+                        st.caption("Preview (first 100 changes of each kind)")
+                        st.dataframe(pd.DataFrame(preview_rows),
+                                     use_container_width=True, hide_index=True)
+                        if st.button("✅ Apply Roster Changes", key="apply_roster"):
+                            # Diff again so changes made since the preview are not undone
+                            st.session_state.pop('roster_preview', None)
+                            if apply_roster_diff(compute_roster_diff(roster), apply_removals=apply_removals):
+                                st.success("✅ Roster synchronised")
+                                rerun()
+                            else:
+                                st.error("❌ Roster sync failed; no changes were applied")
+                    else:
+                        st.info("Roster is already up to date")
 
         # Additional Admin Features
+        profiler.mark("admin:history")
         st.markdown("---")
         st.subheader("📈 Advanced Admin Features")
 
@@ -331,27 +529,40 @@ if admin_mode == "Admin":
                         st.warning("No history found for this user")
 
         # Data Export
+        profiler.mark("admin:export")
         with st.expander("💾 Data Export & Management", expanded=False):
             col1, col2 = st.columns(2)
             with col1:
-                st.markdown("**📊 Export Today's Data**")
-                if st.button("💾 Export Today's Poll Data", key="export_today"):
-                    export_data = export_poll_data(today)
-                    if export_data:
-                        export_df = pd.DataFrame(export_data, columns=[
-                                                 'Employee ID', 'Employee Name', 'Submitted'])
-                        export_df['Status'] = export_df['Submitted'].apply(
-                            lambda x: 'Submitted' if x else 'Pending')
-                        csv = export_df.to_csv(index=False)
-                        st.download_button(
-                            label="💾 Download CSV",
-                            data=csv,
-                            file_name=f"poll_data_{today}.csv",
-                            mime="text/csv"
-                        )
-                        st.success(f"✅ Data exported for {today}")
-                    else:
-                        st.warning("No data to export")
+                st.markdown("**📊 Export Poll Data**")
+                export_range = st.date_input(
+                    "Date range:", value=(ist_today, ist_today), max_value=ist_today, key="export_range")
+                export_emp_id = st.number_input(
+                    "Employee ID (0 for everyone):", min_value=0, step=1, key="export_emp_id")
+                export_format = st.selectbox(
+                    "Format:", ["CSV", "Parquet"], key="export_format")
+                if st.button("💾 Export Poll Data", key="export_range_btn"):
+                    start_date, end_date = (export_range if len(export_range) == 2
+                                            else (export_range[0], export_range[0]))
+                    fmt = export_format.lower()
+                    # Rows are streamed straight into a temp file instead of a DataFrame
+                    # The export itself streams to disk, but st.download_button reads the
+                    # whole file into the session's media store; see README "Exporting data"
+                    with tempfile.TemporaryFile() as export_file:
+                        rows_written = export_poll_range(
+                            export_file, start_date, end_date, fmt=fmt,
+                            emp_id=export_emp_id or None)
+                        if rows_written:
+                            export_file.seek(0)
+                            st.download_button(
+                                label=f"💾 Download {export_format}",
+                                data=export_file,
+                                file_name=f"poll_data_{start_date}_{end_date}.{fmt}",
+                                mime="text/csv" if fmt == "csv" else "application/octet-stream"
+                            )
+                            st.success(
+                                f"✅ Exported {rows_written} rows for {start_date} to {end_date}")
+                        else:
+                            st.warning("No data to export")
 
             with col2:
                 st.markdown("**🗑️ Individual User Reset**")
@@ -360,16 +571,62 @@ if admin_mode == "Admin":
                 if st.button("🔄 Reset User Submission", key="reset_individual_user"):
                     user_info = get_user_by_emp_id(reset_emp_id)
                     if user_info:
-                        if reset_user_submission(user_info['id'], today):
+                        discarded = write_queue.discard(user_info['id'], today)
+                        if reset_user_submission(user_info['id'], today) or discarded:
                             st.success(
                                 f"✅ Reset submission for {user_info['emp_name']} (ID: {reset_emp_id})")
-                            st.rerun()
+                            rerun()
                         else:
                             st.warning(
                                 f"No submission found for {user_info['emp_name']} today")
                     else:
                         st.error("❌ Employee ID not found")
 
+        # Per-rerun SQL instrumentation
+        profiler.mark("admin:performance")
+        with st.expander("⚡ Performance", expanded=False):
+            reruns = query_stats.recent_reruns()
+            if reruns:
+                st.markdown(f"**🕒 Last {len(reruns)} Reruns (this process)**")
+                st.dataframe(pd.DataFrame([
+                    {
+                        'Time': datetime.fromtimestamp(r['started']).strftime('%H:%M:%S'),
+                        'View': r['label'],
+                        'Queries': r['queries'],
+                        'DB ms': round(r['db_ms'], 1),
+                        'Total ms': round(r['total_ms'], 1),
+                    } for r in reruns
+                ]), use_container_width=True, hide_index=True)
+
+                latest = reruns[0]
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.markdown("**🧩 Queries by Function (last rerun)**")
+                    st.dataframe(pd.DataFrame([
+                        {'Function': name, 'Queries': count, 'DB ms': round(total, 1)}
+                        for name, (count, total) in sorted(
+                            latest['functions'].items(), key=lambda item: item[1][1], reverse=True)
+                    ]), use_container_width=True, hide_index=True)
+                with col2:
+                    st.markdown("**🐢 Slowest Statements (last rerun)**")
+                    st.dataframe(pd.DataFrame([
+                        {'ms': round(ms, 1), 'Function': name, 'SQL': ' '.join(sql.split())[:200]}
+                        for ms, name, sql in latest['slowest']
+                    ]), use_container_width=True, hide_index=True)
+            else:
+                st.info("No reruns recorded yet")
+            sections = profiler.slowest_sections()
+            if sections:
+                st.markdown("**⏱️ Slowest Sections (profiled reruns)**")
+                st.dataframe(pd.DataFrame(sections, columns=[
+                    'Section', 'Reruns', 'Mean ms', 'Max ms']).round(1),
+                    use_container_width=True, hide_index=True)
+            if query_stats.SLOW_QUERY_LOG:
+                st.caption(
+                    f"Statements over {query_stats.SLOW_QUERY_MS:.0f} ms are logged to {query_stats.SLOW_QUERY_LOG}")
+            st.caption(f"Process startup (database init and pool warm-up): "
+                       f"{startup_info['startup_seconds'] * 1000:.1f} ms")
+
         st.markdown("---")
 
         col1, col2 = st.columns(2)
@@ -385,7 +642,7 @@ if admin_mode == "Admin":
                         if add_user(new_emp_id, new_emp_name.strip()):
                             st.success(
                                 f"✅ User {new_emp_id}:{new_emp_name} added")
-                            st.rerun()
+                            rerun()
                         else:
                             st.error("❌ Employee ID already exists")
                     else:
@@ -398,16 +655,16 @@ if admin_mode == "Admin":
                 if st.button("🗑️ Remove User", key="remove_single_user"):
                     if remove_user(remove_emp_id):
                         st.success(f"✅ User {remove_emp_id} removed")
-                        st.rerun()
+                        rerun()
                     else:
                         st.error("❌ Employee ID not found")
             st.markdown("---")
 
         # View stats
+        profiler.mark("admin:poll_stats")
         st.subheader("📈 Poll Statistics")
-        stats = get_poll_stats(today)
-        submitted_count = sum(1 for _, _, status in stats if status == 1)
-        total_count = len(stats)
+        total_count = count_user_status(today)
+        submitted_count = count_user_status(today, 'submitted')
         pending_count = total_count - submitted_count
         completion_rate = (submitted_count / total_count *
                            100) if total_count > 0 else 0
@@ -446,6 +703,7 @@ if admin_mode == "Admin":
                 """, unsafe_allow_html=True)
 
         # Enhanced Progress visualization
+        profiler.mark("admin:donut")
         if total_count > 0:
             # Create a modern donut chart
             fig = go.Figure(
@@ -489,69 +747,62 @@ if admin_mode == "Admin":
             st.plotly_chart(fig, use_container_width=True)
 
             # Detailed user list with enhanced styling
+            profiler.mark("admin:user_table")
             st.subheader("👤 Detailed User Status")
-            if stats:
-                # Filter options
-                col1, col2 = st.columns([1, 3])
-                with col1:
-                    show_filter = st.selectbox(
-                        "🔍 Filter by Status:", ["All", "Submitted", "Pending"],
-                        help="Filter users by their submission status"
-                    )
-                # Create DataFrame for better display
-                df_data = []
-                for emp_id, emp_name, status in stats:
-                    df_data.append(
-                        {
-                            'Employee ID': emp_id,
-                            'Employee Name': emp_name,
-                            'Status': '✅ Submitted' if status == 1 else '❌ Pending',
-                            'Status_Raw': status
-                        }
-                    )
-                df = pd.DataFrame(df_data)
-                if show_filter == "Submitted":
-                    df_filtered = df[df['Status_Raw'] == 1]
-                elif show_filter == "Pending":
-                    df_filtered = df[df['Status_Raw'] == 0]
-                else:
-                    df_filtered = df
-
-                # Display filtered data
-                display_df = df_filtered[[
-                    'Employee ID', 'Employee Name', 'Status']].copy()
-                st.dataframe(
-                    display_df,
-                    use_container_width=True,
-                    hide_index=True,
-                    column_config={
-                        "Employee ID": st.column_config.NumberColumn(
-                            "Employee ID",
-                            help="Employee identification number",
-                            format="%d"
-                        ),
-                        "Employee Name": st.column_config.TextColumn(
-                            "Employee Name",
-                            help="Full name of the employee"
-                        ),
-                        "Status": st.column_config.TextColumn(
-                            "Status",
-                            help="Current submission status"
-                        )
-                    }
+            # Filter options; filtering, search and paging all run in SQL
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                show_filter = st.selectbox(
+                    "🔍 Filter by Status:", ["All", "Submitted", "Pending"],
+                    help="Filter users by their submission status"
                 )
+            with col2:
+                user_search = st.text_input(
+                    "🔎 Search:", placeholder="Name or Employee ID prefix", key="admin_user_search")
+            status_filter = {'Submitted': 'submitted', 'Pending': 'pending'}.get(show_filter)
+            page = paged_user_list("admin_users", today, status_filter, user_search)
+
+            # Display the current page
+            display_df = pd.DataFrame([
+                {
+                    'Employee ID': emp_id,
+                    'Employee Name': emp_name,
+                    'Status': '✅ Submitted' if submitted else '❌ Pending'
+                } for emp_id, emp_name, submitted in page
+            ], columns=['Employee ID', 'Employee Name', 'Status'])
+            st.dataframe(
+                display_df,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Employee ID": st.column_config.NumberColumn(
+                        "Employee ID",
+                        help="Employee identification number",
+                        format="%d"
+                    ),
+                    "Employee Name": st.column_config.TextColumn(
+                        "Employee Name",
+                        help="Full name of the employee"
+                    ),
+                    "Status": st.column_config.TextColumn(
+                        "Status",
+                        help="Current submission status"
+                    )
+                }
+            )
     elif password != "":
         st.error("❌ Invalid password")
-        st.stop()
+        stop()
     else:
         st.info("🔐 Please enter the admin password to continue")
-        st.stop()
+        stop()
     st.markdown('</div>', unsafe_allow_html=True)
-    st.stop()
+    stop()
 
 # Regular user interface (only shown when not in admin mode)
 
 if admin_mode == "User":
+    profiler.mark("user:header")
     ist_today = get_ist_date()
     hours, minutes, seconds, total_seconds, ended = get_timer_info()
 
@@ -572,176 +823,230 @@ if admin_mode == "User":
     """
     st.markdown(header_html, unsafe_allow_html=True)
 
-    if not ended:
-        timer_js = f"""
-        <script>
-            let totalSeconds = {total_seconds};
-            function updateTimer() {{
-                if (totalSeconds <= 0) {{
-                    const t = parent.document.getElementById('timerDisplay');
-                    if (t) {{ t.innerHTML = 'Poll Ended'; }}
-                    return;
-                }}
-                const h = Math.floor(totalSeconds / 3600);
-                const m = Math.floor((totalSeconds % 3600) / 60);
-                const s = totalSeconds % 60;
-                const t = parent.document.getElementById('timerDisplay');
-                if (t) {{
-                    t.innerHTML = 'Poll ends in ' + String(h).padStart(2, '0') + ':' + String(m).padStart(2, '0') + ':' + String(s).padStart(2, '0');
-                }}
-                totalSeconds--;
-            }}
-            updateTimer();
-            setInterval(updateTimer, 1000);
-        </script>
-        """
-        components.html(timer_js, height=0)
-
     if not is_poll_time_active() or is_poll_manually_ended():
+        # The first rerun after the deadline closes the day's summary
+        write_queue.finalize_due_poll_day()
         st.error(
             f"⏰ Poll is not active. It ended at {get_poll_end_time()} IST.")
-        st.stop()
+        stop()
+
+    def require_open_poll():
+        """Fragment reruns skip the check above, so repeat it before acting; once the
+        deadline has passed or an admin ended the poll, rerun the app to show the closed page"""
+        if not is_poll_time_active() or is_poll_manually_ended():
+            st.rerun(scope="app")
+
+    # Client-side countdown against the absolute deadline. The component's HTML
+    # only changes with the deadline or settings version, so the browser keeps
+    # the running timer across reruns and reloads it after an extension
+    @st.fragment(run_every=TIMER_CHECK_SECONDS)
+    @fragment_scope("User:timer")
+    def poll_timer():
+        require_open_poll()
+        timer_source = poll_timer_source()
+        if not timer_source:
+            return
+        settings = get_poll_settings()
+        ist_tz = pytz.timezone('Asia/Kolkata')
+        deadline = ist_tz.localize(datetime.combine(ist_today, settings.deadline))
+        components.html(f"""
+        <script>{timer_source}</script>
+        <script>
+            // settings version {settings.version}
+            new PollTimer(new Date({int(deadline.timestamp() * 1000)}), "timerDisplay", parent.document);
+        </script>
+        """, height=0)
+
+    profiler.mark("user:timer")
+    poll_timer()
 
-    users = get_users()
     today = str(ist_today)
-    submitted_users = [f"{emp_id}: {emp_name}" for uid, emp_id,
-                       emp_name in users if get_user_submission_status(uid, today)]
-    not_submitted_users = [f"{emp_id}: {emp_name}" for uid, emp_id,
-                           emp_name in users if not get_user_submission_status(uid, today)]
-
-    # Status section
-    st.markdown(f"""
-    <div class="section">
-        <h3>📊 Current Poll Status</h3>
-        <div class="status-grid">
-            <div class="status-card success">
-                <div class="status-number">{len(submitted_users)}</div>
-                <div class="status-label">✅ Submitted</div>
-            </div>
-            <div class="status-card danger">
-                <div class="status-number">{len(not_submitted_users)}</div>
-                <div class="status-label">❌ Pending</div>
+
+    def load_poll_counts():
+        """Today's submitted/total counts, kept in session state and recounted only
+        when the data version or the number of queued submissions moves"""
+        # Submissions acknowledged by the write queue but not flushed yet
+        stamp = (get_data_version(), len(write_queue.pending_for(today)))
+        view = st.session_state.get('poll_counts')
+        if view and view['date'] == today and view['stamp'] == stamp:
+            return view
+        total = count_user_status(today)
+        submitted = min(total, count_user_status(today, 'submitted') + stamp[1])
+        view = {'date': today, 'stamp': stamp, 'submitted': submitted, 'total': total,
+                'updated': datetime.now().strftime('%H:%M:%S')}
+        st.session_state.poll_counts = view
+        return view
+
+    # Status cards, user lists and progress; refreshed on a timer instead of by full reruns
+    @st.fragment(run_every=STATUS_REFRESH_SECONDS)
+    @fragment_scope("User:status")
+    def poll_status_section():
+        counts = load_poll_counts()
+        submitted_count = counts['submitted']
+        total_users = counts['total']
+        pending_count = total_users - submitted_count
+
+        # Status section
+        st.markdown(f"""
+        <div class="section">
+            <h3>📊 Current Poll Status</h3>
+            <div class="status-grid">
+                <div class="status-card success">
+                    <div class="status-number">{submitted_count}</div>
+                    <div class="status-label">✅ Submitted</div>
+                </div>
+                <div class="status-card danger">
+                    <div class="status-number">{pending_count}</div>
+                    <div class="status-label">❌ Pending</div>
+                </div>
             </div>
         </div>
-    </div>
-    """, unsafe_allow_html=True)
+        """, unsafe_allow_html=True)
 
-    # User lists
-    col1, col2 = st.columns(2)
-    with col1:
-        if submitted_users:
-            with st.expander(f"👥 View {len(submitted_users)} Submitted Users"):
-                for user in submitted_users:
-                    st.markdown(
-                        f"<div class='user-list-item'>• {user}</div>", unsafe_allow_html=True)
-    with col2:
-        if not_submitted_users:
-            with st.expander(f"👥 View {len(not_submitted_users)} Pending Users"):
-                for user in not_submitted_users:
-                    st.markdown(
-                        f"<div class='user-list-item'>• {user}</div>", unsafe_allow_html=True)
-
-    # Enhanced Progress bar with real-time updates
-    total_users = len(users)
-    submitted_count = len(submitted_users)
-    pending_count = len(not_submitted_users)
-    progress_percent = (submitted_count / total_users) * \
-        100 if total_users else 0
-
-    # Combined progress and poll form section with seamless design
-    current_time = datetime.now().strftime('%H:%M:%S')
-    st.markdown(f"""
-    <div class="combined-poll-section">
-        <div class="progress-section-integrated">
-            <div class="progress-header">
-                <h4>📊 Poll Progress</h4>
-                <div class="progress-stats">
-                    <span class="stat-item submitted">✅ {submitted_count} Submitted</span>
-                    <span class="stat-item pending">❌ {pending_count} Pending</span>
-                    <span class="stat-item total">👥 {total_users} Total</span>
+        # User lists; one searchable page each, sent as a single element
+        col1, col2 = st.columns(2)
+        for column, status, count, label in [(col1, 'submitted', submitted_count, "Submitted"),
+                                             (col2, 'pending', pending_count, "Pending")]:
+            with column:
+                if count:
+                    with st.expander(f"👥 View {count} {label} Users"):
+                        search = st.text_input(
+                            "🔎 Search:", placeholder="Name or Employee ID prefix",
+                            key=f"{status}_user_search")
+                        page = paged_user_list(f"{status}_users", today, status, search)
+                        st.markdown(''.join(
+                            f"<div class='user-list-item'>• {emp_id}: {html.escape(emp_name)}</div>"
+                            for emp_id, emp_name, _ in page), unsafe_allow_html=True)
+
+        # Enhanced Progress bar with real-time updates
+        progress_percent = (submitted_count / total_users) * \
+            100 if total_users else 0
+
+        st.markdown(f"""
+        <div class="combined-poll-section">
+            <div class="progress-section-integrated">
+                <div class="progress-header">
+                    <h4>📊 Poll Progress</h4>
+                    <div class="progress-stats">
+                        <span class="stat-item submitted">✅ {submitted_count} Submitted</span>
+                        <span class="stat-item pending">❌ {pending_count} Pending</span>
+                        <span class="stat-item total">👥 {total_users} Total</span>
+                    </div>
+                </div>
+                <div class="progress-container" data-progress="{progress_percent:.1f}">
+                    {f'<div class="progress-bar progress-animated" style="width: {progress_percent}%;" data-width="{progress_percent}"><span class="progress-text">{progress_percent:.1f}%</span></div>' if progress_percent > 0 else '<div class="progress-empty"><span class="progress-text-empty">0.0% - No submissions yet</span></div>'}
+                </div>
+                <div class="progress-footer">
+                    <small>Checks for updates every {STATUS_REFRESH_SECONDS}s • Last changed: {counts['updated']}</small>
                 </div>
-            </div>
-            <div class="progress-container" data-progress="{progress_percent:.1f}">
-                {f'<div class="progress-bar progress-animated" style="width: {progress_percent}%;" data-width="{progress_percent}"><span class="progress-text">{progress_percent:.1f}%</span></div>' if progress_percent > 0 else '<div class="progress-empty"><span class="progress-text-empty">0.0% - No submissions yet</span></div>'}
-            </div>
-            <div class="progress-footer">
-                <small>Progress updates automatically with each submission • Last updated: {current_time}</small>
             </div>
         </div>
+        """, unsafe_allow_html=True)
+
+    # Submit/reset tabs; a click reruns only this section
+    @st.fragment
+    @fragment_scope("User:forms")
+    def poll_form_section():
+        st.markdown("""
         <div class="poll-form-integrated">
             <h3 class="poll-form-title">📝 Submit Your Response</h3>
-    """, unsafe_allow_html=True)
-
-    # Poll form content without the separate container
-    # Title is now handled in the HTML above
+        </div>
+        """, unsafe_allow_html=True)
 
-    # Create tabs for submit and reset
-    tab1, tab2 = st.tabs(["🚀 Submit Poll", "🔄 Reset My Submission"])
+        # Create tabs for submit and reset
+        tab1, tab2 = st.tabs(["🚀 Submit Poll", "🔄 Reset My Submission"])
 
-    with tab1:
-        employee_id_input = st.text_input(
-            "🆔 Employee ID:", placeholder="Enter your Employee ID (e.g., 1001)", key="submit_emp_id")
-        if st.button("🚀 Submit Poll", use_container_width=True, key="submit_poll_btn"):
-            if not employee_id_input.strip():
-                st.warning("⚠️ Please enter your Employee ID.")
-            else:
-                try:
-                    employee_id = int(employee_id_input)
-                except ValueError:
-                    st.error("❌ Employee ID must be a number.")
+        with tab1:
+            employee_id_input = st.text_input(
+                "🆔 Employee ID:", placeholder="Enter your Employee ID (e.g., 1001)", key="submit_emp_id")
+            if st.button("🚀 Submit Poll", use_container_width=True, key="submit_poll_btn"):
+                require_open_poll()
+                if not employee_id_input.strip():
+                    st.warning("⚠️ Please enter your Employee ID.")
                 else:
-                    found_user = next(
-                        ((uid, name) for uid, emp_id, name in users if emp_id == employee_id), None)
-                    if found_user:
-                        uid, name = found_user
-                        if get_user_submission_status(uid, today):
-                            st.info(f"ℹ️ {name} has already submitted today.")
-                            st.info(
-                                "📝 You can reset your submission using the 'Reset My Submission' tab if needed.")
-                        else:
-                            submit_poll(uid, today)
-                            st.success(
-                                f"🎉 Thanks {name}, your response has been recorded.")
-                            st.balloons()
-                            time.sleep(1)
-                            st.rerun()
+                    try:
+                        employee_id = int(employee_id_input)
+                    except ValueError:
+                        st.error("❌ Employee ID must be a number.")
                     else:
-                        st.error("❌ Employee ID not found.")
+                        user_info = get_user_by_emp_id(employee_id)
+                        if user_info:
+                            uid, name = user_info['id'], user_info['emp_name']
+                            status_map = get_submission_status_map(today)
+                            status_map.update(write_queue.pending_for(today))
+                            if status_map.get(uid, False):
+                                st.info(f"ℹ️ {name} has already submitted today.")
+                                st.info(
+                                    "📝 You can reset your submission using the 'Reset My Submission' tab if needed.")
+                            else:
+                                write_queue.submit_poll(uid, today)
+                                st.success(
+                                    f"🎉 Thanks {name}, your response has been recorded.")
+                                st.balloons()
+                        else:
+                            st.error("❌ Employee ID not found.")
 
-    with tab2:
-        st.markdown("📝 **Reset Your Submission**")
-        st.info(
-            "ℹ️ Use this if you want to change your submission or if you submitted by mistake.")
+        with tab2:
+            st.markdown("📝 **Reset Your Submission**")
+            st.info(
+                "ℹ️ Use this if you want to change your submission or if you submitted by mistake.")
 
-        reset_employee_id_input = st.text_input(
-            "🆔 Employee ID:", placeholder="Enter your Employee ID (e.g., 1001)", key="reset_emp_id")
+            reset_employee_id_input = st.text_input(
+                "🆔 Employee ID:", placeholder="Enter your Employee ID (e.g., 1001)", key="reset_emp_id")
 
-        if st.button("🔄 Reset My Submission", use_container_width=True, key="reset_my_submission", type="secondary"):
-            if not reset_employee_id_input.strip():
-                st.warning("⚠️ Please enter your Employee ID.")
-            else:
-                try:
-                    reset_employee_id = int(reset_employee_id_input)
-                except ValueError:
-                    st.error("❌ Employee ID must be a number.")
+            if st.button("🔄 Reset My Submission", use_container_width=True, key="reset_my_submission", type="secondary"):
+                require_open_poll()
+                if not reset_employee_id_input.strip():
+                    st.warning("⚠️ Please enter your Employee ID.")
                 else:
-                    # Simple direct reset like admin - no complex confirmations
-                    user_info = get_user_by_emp_id(reset_employee_id)
-                    if user_info:
-                        if reset_user_submission(user_info['id'], today):
-                            st.success(f"✅ Reset submission for {user_info['emp_name']} (ID: {reset_employee_id})")
-                            st.info("📝 You can now submit again using the 'Submit Poll' tab.")
-                            st.balloons()
-                            time.sleep(1)
-                            st.rerun()
-                        else:
-                            st.warning(f"No submission found for {user_info['emp_name']} today or reset failed")
+                    try:
+                        reset_employee_id = int(reset_employee_id_input)
+                    except ValueError:
+                        st.error("❌ Employee ID must be a number.")
                     else:
-                        st.error("❌ Employee ID not found")
+                        # Simple direct reset like admin - no complex confirmations
+                        user_info = get_user_by_emp_id(reset_employee_id)
+                        if user_info:
+                            discarded = write_queue.discard(user_info['id'], today)
+                            if reset_user_submission(user_info['id'], today) or discarded:
+                                st.success(f"✅ Reset submission for {user_info['emp_name']} (ID: {reset_employee_id})")
+                                st.info("📝 You can now submit again using the 'Submit Poll' tab.")
+                                st.balloons()
+                            else:
+                                st.warning(f"No submission found for {user_info['emp_name']} today or reset failed")
+                        else:
+                            st.error("❌ Employee ID not found")
 
-    # Close the combined poll section
-    st.markdown('</div></div>', unsafe_allow_html=True)
+    profiler.mark("user:status")
+    poll_status_section()
+    profiler.mark("user:forms")
+    poll_form_section()
+
+    # Typing an Employee ID here reruns only this lookup
+    @st.fragment
+    @fragment_scope("User:quick_status")
+    def quick_status_check():
+        quick_check_id = st.text_input(
+            "Enter your Employee ID to check status:", key="quick_status_check")
+        if quick_check_id:
+            try:
+                check_emp_id = int(quick_check_id)
+                user_info = get_user_by_emp_id(check_emp_id)
+                if user_info:
+                    uid, name = user_info['id'], user_info['emp_name']
+                    status_map = get_submission_status_map(today)
+                    status_map.update(write_queue.pending_for(today))
+                    status = status_map.get(uid, False)
+                    if status:
+                        st.success(f"✅ {name}, you have submitted today")
+                    else:
+                        st.info(f"📝 {name}, you haven't submitted today yet")
+                else:
+                    st.error("❌ Employee ID not found")
+            except ValueError:
+                st.error("❌ Please enter a valid Employee ID")
 
+    profiler.mark("user:help")
     with st.expander("ℹ️ Need Help?"):
         st.markdown("""
         **How to use this system:**
@@ -774,21 +1079,6 @@ if admin_mode == "User":
         # Add a quick status check
         st.markdown("---")
         st.markdown("**🔍 Quick Status Check:**")
-        quick_check_id = st.text_input(
-            "Enter your Employee ID to check status:", key="quick_status_check")
-        if quick_check_id:
-            try:
-                check_emp_id = int(quick_check_id)
-                found_user = next(
-                    ((uid, name) for uid, emp_id, name in users if emp_id == check_emp_id), None)
-                if found_user:
-                    uid, name = found_user
-                    status = get_user_submission_status(uid, today)
-                    if status:
-                        st.success(f"✅ {name}, you have submitted today")
-                    else:
-                        st.info(f"📝 {name}, you haven't submitted today yet")
-                else:
-                    st.error("❌ Employee ID not found")
-            except ValueError:
-                st.error("❌ Please enter a valid Employee ID")
+        quick_status_check()
+
+end_of_rerun()
@@ -0,0 +1,67 @@
+"""Minified copies of the static CSS and JavaScript, read once per process.
+
+Streamlit's static file handler (enableStaticServing) serves .css and .js as
+text/plain with nosniff, so browsers will not apply or run them from a URL.
+app.py therefore inlines these cached, minified strings instead of re-reading
+and re-sending the full source files on every rerun.
+
+    python assets.py            # print the size of each asset before and after
+"""
+import os
+import re
+
+STATIC_DIR = 'static'
+
+# Asset name -> source path under STATIC_DIR
+ASSETS = {
+    'css': 'css/modern_style.css',
+    'timer_js': 'js/enhanced_timer.js',
+}
+
+
+def minify_css(text):
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    # ':' is left alone; the space in "a :hover" is significant
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    return text.replace(';}', '}').strip()
+
+
+def minify_js(text):
+    # Line-based only: drop indentation, blank lines and whole-line comments,
+    # which never changes what a statement, string or regex means
+    lines = (line.strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//')) + '\n'
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def read_asset(source):
+    """Read and minify one source file under STATIC_DIR"""
+    with open(os.path.join(STATIC_DIR, source), encoding='utf-8') as f:
+        return MINIFIERS[os.path.splitext(source)[1]](f.read())
+
+
+def load_assets():
+    """{asset name: minified source} for every asset that could be read"""
+    loaded = {}
+    for asset, source in ASSETS.items():
+        try:
+            loaded[asset] = read_asset(source)
+        except OSError as e:
+            print(f"Could not read static asset {source}: {e}")
+    return loaded
+
+
+def js_class(source, name):
+    """Just the top-level `class name` of a script, up to the next top-level class"""
+    match = re.search(rf"^class {re.escape(name)} \{{$.*?(?=^class |\Z)", source, flags=re.S | re.M)
+    return match.group(0) if match else None
+
+
+if __name__ == "__main__":
+    for asset, source in ASSETS.items():
+        with open(os.path.join(STATIC_DIR, source), encoding='utf-8') as f:
+            original = len(f.read())
+        print(f"{asset:<10} {original:>7} -> {len(read_asset(source)):>7} bytes")
@@ -0,0 +1,203 @@
+"""Micro-benchmarks for the database.py helpers.
+
+Seeds a local SQLite database with synthetic users and submission history,
+times each helper over several runs and reports p50/p95/p99 latency and the
+number of SQL statements per call.
+
+    python benchmark.py --users 2000 --days 30 --runs 20 --output bench.json
+    python benchmark.py --users 2000 --days 30 --compare bench.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+from datetime import timedelta
+
+from sqlalchemy import event, insert
+
+import database
+from models import Base, Submission, SessionLocal, create_db_engine
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def seed(users, days, submit_ratio, seed_value=42):
+    """Fill the database with `users` employees and `days` days of submissions"""
+    rng = random.Random(seed_value)
+    today = database.get_ist_date()
+    database.bulk_add_users([(1000 + i, f"Employee {i}") for i in range(users)])
+
+    db = SessionLocal()
+    try:
+        user_ids = [uid for uid, _, _ in database.get_users()]
+        dates = [today - timedelta(days=offset) for offset in range(days)]
+        for day in dates:
+            rows = [{'user_id': uid, 'submission_date': day, 'submitted': True}
+                    for uid in user_ids if rng.random() < submit_ratio]
+            for chunk in database._chunks(rows, database.BULK_CHUNK_SIZE):
+                db.execute(insert(Submission), chunk)
+        database._refresh_daily_summary(db, dates)
+        db.commit()
+    finally:
+        db.close()
+    return user_ids
+
+
+def time_call(counter, func, runs, setup=None):
+    latencies = []
+    queries = []
+    for run in range(runs):
+        if setup:
+            setup(run)
+        counter.count = 0
+        started = time.perf_counter()
+        func(run)
+        latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count)
+    return {
+        'runs': runs,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'queries': max(queries),
+    }
+
+
+def run_benchmarks(args):
+    db_path = os.path.join(tempfile.mkdtemp(prefix='dps-bench-'), 'bench.db')
+    engine = create_db_engine(f"sqlite:///{db_path}")
+    SessionLocal.configure(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    database.init_db(migrate=False)
+    counter = QueryCounter(engine)
+
+    user_ids = seed(args.users, args.days, args.submit_ratio)
+    today = database.get_ist_date()
+    archive_dir = os.path.join(os.path.dirname(db_path), 'archive')
+    next_emp_id = [10 ** 7]
+
+    def new_users(run):
+        rows = [(next_emp_id[0] + i, f"Bulk {i}") for i in range(args.bulk_size)]
+        next_emp_id[0] += args.bulk_size
+        database.bulk_add_users(rows)
+
+    def reseed_old_day(run):
+        day = today - timedelta(days=args.days + run + 1)
+        db = SessionLocal()
+        try:
+            db.execute(insert(Submission), [
+                {'user_id': uid, 'submission_date': day, 'submitted': True} for uid in user_ids])
+            db.commit()
+        finally:
+            db.close()
+
+    def clear_read_caches(run):
+        # Drop the roster and version caches so each run measures the queries themselves
+        database.invalidate_roster()
+        database._version_cache.clear()
+
+    benchmarks = {
+        'get_users': (lambda run: database.get_users(), clear_read_caches),
+        'get_user_by_emp_id': (lambda run: database.get_user_by_emp_id(1000 + run % args.users),
+                               clear_read_caches),
+        'get_poll_stats': (lambda run: database.get_poll_stats(today), None),
+        'get_submission_status_map': (lambda run: database.get_submission_status_map(today),
+                                      clear_read_caches),
+        'submit_poll': (lambda run: database.submit_poll(user_ids[run % len(user_ids)], today), None),
+        'bulk_add_users': (new_users, None),
+        # Clear the cache first so each run measures the aggregate query itself
+        'get_admin_dashboard_stats': (lambda run: database.get_admin_dashboard_stats(today),
+                                      lambda run: database._dashboard_cache.clear()),
+        # Clear the version cache so each run measures the page query itself
+        'get_user_status_page': (lambda run: database.get_user_status_page(today, 'pending', 'Employee 1'),
+                                 lambda run: database._version_cache.clear()),
+        'get_poll_history': (lambda run: database.get_poll_history(args.days), None),
+        'clear_old_submissions': (
+            lambda run: database.clear_old_submissions(
+                retention_days=args.days, archive_dir=archive_dir), reseed_old_day),
+    }
+
+    results = {}
+    for name, (func, setup) in benchmarks.items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = time_call(counter, func, args.runs, setup)
+        print(f"{name:<28} p50 {results[name]['p50_ms']:>9.2f} ms  "
+              f"p95 {results[name]['p95_ms']:>9.2f} ms  "
+              f"p99 {results[name]['p99_ms']:>9.2f} ms  "
+              f"{results[name]['queries']:>4} queries")
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Print the change against a saved run; returns the names that regressed"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+    regressions = []
+    print(f"\nCompared with {baseline_path}:")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        change = (current['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] if previous['p50_ms'] else 0
+        flag = ''
+        if change > threshold or current['queries'] > previous['queries']:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<28} p50 {change:+8.1%}  queries {previous['queries']} -> {current['queries']}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--submit-ratio', type=float, default=0.8)
+    parser.add_argument('--bulk-size', type=int, default=1000)
+    parser.add_argument('--only', nargs='*', help='Benchmark names to run')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='p50 slowdown treated as a regression (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'commit': git_commit(),
+                'params': {'users': args.users, 'days': args.days, 'runs': args.runs,
+                           'submit_ratio': args.submit_ratio, 'bulk_size': args.bulk_size},
+                'results': results,
+            }, f, indent=2)
+    if args.compare and compare(results, args.compare, args.threshold):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,17 @@ from database import clear_old_submissions
 from datetime import datetime
 
 
+def report_progress(deleted, rows_per_second):
+    print(f"Cleanup progress: {deleted} rows removed ({rows_per_second:.0f} rows/s)")
+
+
 def cleanup_task():
-    clear_old_submissions()
+    stats = clear_old_submissions(progress=report_progress)
     ist = pytz.timezone('Asia/Kolkata')
     ist_time = datetime.now(ist)
-    print(f"Cleanup completed at {ist_time.strftime('%Y-%m-%d %H:%M:%S IST')}")
+    print(f"Cleanup completed at {ist_time.strftime('%Y-%m-%d %H:%M:%S IST')}: "
+          f"{stats['archived']} rows archived to {len(stats['files'])} files, "
+          f"{stats['deleted']} rows deleted in {stats['seconds']:.1f}s")
 
 
 def is_first_day_of_month_ist():
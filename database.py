@@ -1,13 +1,155 @@
+import os
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
+from types import MappingProxyType
 import pytz
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from alembic.config import Config
 from alembic import command
-from models import Base, User, Submission, AdminSettings, engine
+from models import Base, User, Submission, AdminSettings, PollDailySummary, PollState, engine, SessionLocal
 
 IST_TZ = 'Asia/Kolkata'
+DEFAULT_POLL_END_TIME = '18:30'
+DEFAULT_ADMIN_PASSWORD = 'admin123'
+POLL_SETTINGS_TTL = float(os.getenv('POLL_SETTINGS_TTL', '5'))
+# Rows per IN query / bulk INSERT; keeps statements well under max_allowed_packet
+BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', '1000'))
+
+# Immutable snapshot of the AdminSettings row; `deadline` is the parsed end time
+# and `version` is poll_state.settings_version when it was read
+PollSettings = namedtuple(
+    'PollSettings', ['poll_end_time', 'poll_manually_ended', 'password', 'deadline', 'version'])
+
+_poll_settings_lock = threading.Lock()
+_poll_settings_cache = {'settings': None, 'loaded_at': 0.0, 'generation': 0}
+
+# Process-wide roster snapshot shared by all sessions; dropped by the roster
+# helpers below and re-read after ROSTER_CACHE_TTL in case another process changed it
+ROSTER_CACHE_TTL = float(os.getenv('ROSTER_CACHE_TTL', '300'))
+_roster_lock = threading.Lock()
+_roster_cache = {'roster': None, 'loaded_at': 0.0, 'generation': 0}
+
+# Retention pipeline for clear_old_submissions; an empty archive dir disables archiving
+RETENTION_DAYS = int(os.getenv('RETENTION_DAYS', '0'))
+ARCHIVE_DIR = os.getenv('SUBMISSIONS_ARCHIVE_DIR', 'archive')
+CLEANUP_CHUNK_SIZE = int(os.getenv('CLEANUP_CHUNK_SIZE', '5000'))
+
+# Rows fetched per server-side cursor round trip in iter_poll_export
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '5000'))
+EXPORT_COLUMNS = ['Date', 'Employee ID', 'Employee Name', 'Submitted', 'Status']
+
+# Rows per page in the searchable user lists (get_user_status_page)
+USER_PAGE_SIZE = int(os.getenv('USER_PAGE_SIZE', '25'))
+
+DASHBOARD_CACHE_TTL = float(os.getenv('DASHBOARD_CACHE_TTL', '30'))
+_dashboard_cache_lock = threading.Lock()
+_dashboard_cache = {}
+
+# Read caches keyed on the poll_state data version, shared by all sessions
+_version_cache_lock = threading.Lock()
+_version_cache = {}
+
+# (date, settings version) pairs this process has seen finalized after the deadline
+_finalized_days_lock = threading.Lock()
+_finalized_days = set()
+
+# Session shared by every helper during one Streamlit rerun (see open_rerun_session)
+_rerun_session = ContextVar('rerun_session', default=None)
+
+
+def open_rerun_session(fresh=False):
+    """Open one session that every helper in this rerun picks up implicitly.
+    fresh=True first closes a session left over by an interrupted rerun, so
+    this rerun does not read through that session's old transaction."""
+    db = _rerun_session.get()
+    if db is not None and fresh:
+        close_rerun_session()
+        db = None
+    if db is None:
+        db = SessionLocal()
+        _rerun_session.set(db)
+    return db
+
+
+def close_rerun_session():
+    """Close the rerun session, returning its connection to the pool"""
+    db = _rerun_session.get()
+    if db is not None:
+        _rerun_session.set(None)
+        db.close()
+
+
+@contextmanager
+def rerun_session():
+    """Context manager form of open_rerun_session/close_rerun_session for scripts"""
+    owner = _rerun_session.get() is None
+    db = open_rerun_session()
+    try:
+        yield db
+    finally:
+        if owner:
+            close_rerun_session()
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_data_version():
+    """Current data version from the poll_state row; a single primary-key read.
+    Every helper that changes users, submissions or the poll schedule bumps it
+    in the same transaction, so it also moves for changes made by other processes.
+    The rerun session remembers it, so a rerun or fragment run reads it only once."""
+    db = _acquire_session()
+    try:
+        if 'data_version' in db.info:
+            return db.info['data_version']
+        version = db.query(PollState.data_version).filter(PollState.id == 1).scalar() or 0
+        if db is _rerun_session.get():
+            db.info['data_version'] = version
+        return version
+    finally:
+        _release_session(db)
+
+
+def _bump_data_version(db, settings=False):
+    # Called before commit so the new version and the change land together;
+    # settings=True also bumps settings_version for end time / manual end changes
+    db.info.pop('data_version', None)
+    values = {'data_version': PollState.data_version + 1}
+    if settings:
+        values['settings_version'] = PollState.settings_version + 1
+    bumped = db.execute(update(PollState).where(PollState.id == 1).values(**values)).rowcount
+    if not bumped:
+        db.add(PollState(id=1, data_version=1, settings_version=1 if settings else 0))
+
+
+def _version_cached(key, loader):
+    """Return loader() cached until the data version moves"""
+    version = get_data_version()
+    with _version_cache_lock:
+        cached = _version_cache.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+    value = loader()
+    with _version_cache_lock:
+        # Entries from older versions will never be hit again
+        for stale in [k for k, (v, _) in _version_cache.items() if v != version]:
+            del _version_cache[stale]
+        _version_cache[key] = (version, value)
+    return value
+
+
+def _acquire_session():
+    db = _rerun_session.get()
+    return db if db is not None else SessionLocal()
+
+
+def _release_session(db):
+    # The rerun session outlives individual helpers; everything else is closed
+    if db is not _rerun_session.get():
+        db.close()
 
 
 def run_migrations():
@@ -15,67 +157,430 @@ def run_migrations():
     command.upgrade(alembic_cfg, "head")
 
 
-def init_db():
-    # Run migrations first
-    try:
-        run_migrations()
-    except Exception:
-        # Fallback to creating tables if migrations fail
-        Base.metadata.create_all(bind=engine)
+def init_db(migrate=True):
+    # Run migrations first (skipped when `python migrate.py` already ran them)
+    if migrate:
+        try:
+            run_migrations()
+        except Exception:
+            # Fallback to creating tables if migrations fail
+            Base.metadata.create_all(bind=engine)
 
-    db = SessionLocal()
+    db = _acquire_session()
     try:
         # Check if admin settings exist, if not create default
         admin = db.query(AdminSettings).filter(AdminSettings.id == 1).first()
         if not admin:
             admin = AdminSettings(
-                id=1, password='admin123', poll_end_time='18:30', poll_manually_ended=False)
+                id=1, password=DEFAULT_ADMIN_PASSWORD, poll_end_time=DEFAULT_POLL_END_TIME,
+                poll_manually_ended=False)
             db.add(admin)
             db.commit()
+            invalidate_poll_settings()
+        if not db.query(PollState).filter(PollState.id == 1).first():
+            db.add(PollState(id=1, data_version=0, settings_version=0))
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
-        db.close()
+        _release_session(db)
 
 
-def get_users():
-    db = SessionLocal()
+def _load_poll_settings():
+    db = _acquire_session()
     try:
-        users = db.query(User.id, User.emp_id,
-                         User.emp_name).order_by(User.emp_id).all()
-        return users
+        admin = db.query(AdminSettings).filter(AdminSettings.id == 1).first()
+        end_time = admin.poll_end_time if admin and admin.poll_end_time else DEFAULT_POLL_END_TIME
+        version = db.query(PollState.settings_version).filter(PollState.id == 1).scalar()
+        return PollSettings(
+            poll_end_time=end_time,
+            poll_manually_ended=bool(admin.poll_manually_ended) if admin else False,
+            password=admin.password if admin else DEFAULT_ADMIN_PASSWORD,
+            deadline=datetime.strptime(end_time, '%H:%M').time(),
+            version=version or 0
+        )
     finally:
-        db.close()
+        _release_session(db)
+
+
+def get_poll_settings():
+    """Get the process-wide PollSettings snapshot, reloading it after POLL_SETTINGS_TTL seconds"""
+    with _poll_settings_lock:
+        settings = _poll_settings_cache['settings']
+        if settings is not None and time.monotonic() - _poll_settings_cache['loaded_at'] < POLL_SETTINGS_TTL:
+            return settings
+        generation = _poll_settings_cache['generation']
+    settings = _load_poll_settings()
+    with _poll_settings_lock:
+        # Don't cache a snapshot that an invalidate_poll_settings() during the load made stale
+        if _poll_settings_cache['generation'] == generation:
+            _poll_settings_cache['settings'] = settings
+            _poll_settings_cache['loaded_at'] = time.monotonic()
+    return settings
+
+
+def invalidate_poll_settings():
+    """Drop the cached PollSettings so the next read goes to the database"""
+    with _poll_settings_lock:
+        _poll_settings_cache['settings'] = None
+        _poll_settings_cache['loaded_at'] = 0.0
+        _poll_settings_cache['generation'] += 1
+
+
+def _load_roster():
+    db = _acquire_session()
+    try:
+        users = tuple((uid, emp_id, emp_name) for uid, emp_id, emp_name in db.query(
+            User.id, User.emp_id, User.emp_name).order_by(User.emp_id))
+    finally:
+        _release_session(db)
+    by_emp_id = MappingProxyType({emp_id: (uid, emp_name) for uid, emp_id, emp_name in users})
+    return users, by_emp_id
+
+
+def _get_roster():
+    with _roster_lock:
+        roster = _roster_cache['roster']
+        if roster is not None and time.monotonic() - _roster_cache['loaded_at'] < ROSTER_CACHE_TTL:
+            return roster
+        generation = _roster_cache['generation']
+    roster = _load_roster()
+    with _roster_lock:
+        # An invalidate_roster() during the load means this copy may predate the change
+        if _roster_cache['generation'] == generation:
+            _roster_cache['roster'] = roster
+            _roster_cache['loaded_at'] = time.monotonic()
+    return roster
+
+
+def get_users():
+    """Get the roster as an immutable tuple of (id, emp_id, emp_name), sorted by
+    emp_id. One copy is shared by every session until a roster change invalidates it."""
+    return _get_roster()[0]
+
+
+def get_roster_index():
+    """Read-only {emp_id: (user_id, emp_name)} built alongside the cached roster"""
+    return _get_roster()[1]
+
+
+def invalidate_roster():
+    """Drop the cached roster so the next get_users() reads the users table"""
+    with _roster_lock:
+        _roster_cache['roster'] = None
+        _roster_cache['loaded_at'] = 0.0
+        _roster_cache['generation'] += 1
 
 
 def get_user_submission_status(user_id, date_str):
-    db = SessionLocal()
+    db = _acquire_session()
     try:
         submission = db.query(Submission).filter(
             Submission.user_id == user_id,
-            Submission.submission_date == date_str
+            Submission.submission_date == _as_date(date_str)
         ).first()
         return submission.submitted if submission else False
     finally:
-        db.close()
+        _release_session(db)
 
 
-def submit_poll(user_id, date_str):
-    db = SessionLocal()
+def _load_submission_status_map(date):
+    db = _acquire_session()
     try:
-        submission = db.query(Submission).filter(
-            Submission.user_id == user_id,
-            Submission.submission_date == date_str
-        ).first()
+        rows = db.query(
+            Submission.user_id,
+            Submission.submitted
+        ).filter(
+            Submission.submission_date == date
+        ).all()
+        return {user_id: bool(submitted) for user_id, submitted in rows}
+    finally:
+        _release_session(db)
+
+
+def get_submission_status_map(date_str):
+    """Get {user_id: submitted} for every submission on a date in one query,
+    re-read only when the data version has moved"""
+    date = _as_date(date_str)
+    status_map = _version_cached(
+        ('status_map', date), lambda: _load_submission_status_map(date))
+    return dict(status_map)
+
+
+def _upsert(db, model, rows, keys, update_columns):
+    """Insert rows into model's table, updating update_columns where the unique
+    keys already exist, in one statement per dialect"""
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == 'mysql':
+        stmt = mysql.insert(model).values(rows)
+        stmt = stmt.on_duplicate_key_update(
+            {column: stmt.inserted[column] for column in update_columns})
+    elif dialect in ('sqlite', 'postgresql'):
+        dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        stmt = dialect_insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={column: stmt.excluded[column] for column in update_columns})
+    else:
+        # Generic fallback for dialects without an upsert construct
+        for row in rows:
+            existing = db.query(model).filter_by(
+                **{key: row[key] for key in keys}).first()
+            if existing:
+                for column in update_columns:
+                    setattr(existing, column, row[column])
+            else:
+                db.add(model(**row))
+        return
+    db.execute(stmt)
+
+
+def _insert_new(db, model, rows, keys):
+    """Insert the rows whose unique keys do not exist yet in one statement per
+    dialect; returns how many were inserted"""
+    if not rows:
+        return 0
+    dialect = db.get_bind().dialect.name
+    if dialect == 'mysql':
+        stmt = mysql.insert(model).values(rows).prefix_with('IGNORE')
+    elif dialect in ('sqlite', 'postgresql'):
+        dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        stmt = dialect_insert(model).values(rows).on_conflict_do_nothing(index_elements=keys)
+    else:
+        inserted = 0
+        for row in rows:
+            if not db.query(model).filter_by(**{key: row[key] for key in keys}).first():
+                db.add(model(**row))
+                inserted += 1
+        db.flush()
+        return inserted
+    return db.execute(stmt).rowcount
+
+
+def _mark_submitted(db, date, user_ids):
+    """Mark user_ids as submitted on date; returns how many were not submitted before"""
+    # Rows are only ever written with submitted=True, but older ones may say False
+    updated = db.query(Submission).filter(
+        Submission.submission_date == date,
+        Submission.user_id.in_(user_ids),
+        Submission.submitted == False
+    ).update({Submission.submitted: True}, synchronize_session=False)
+    inserted = _insert_new(db, Submission, [
+        {'user_id': user_id, 'submission_date': date, 'submitted': True} for user_id in user_ids
+    ], ['user_id', 'submission_date'])
+    return updated + inserted
+
+
+def _as_date(value):
+    """Accept either a date or an ISO 'YYYY-MM-DD' string"""
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    return value
+
+
+def _refresh_daily_summary(db, dates):
+    """Recount submissions for each date into poll_daily_summary (one indexed
+    GROUP BY over just those dates). Finalized days are left untouched. Only for
+    rows loaded in bulk outside the helpers below, e.g. benchmark seeding: the
+    count is not a locking read, so concurrent writers must use
+    _add_to_daily_summary instead."""
+    dates = sorted({_as_date(d) for d in dates})
+    if not dates:
+        return
+    from sqlalchemy import func
+    counts = dict(db.query(
+        Submission.submission_date,
+        func.count(Submission.id)
+    ).filter(
+        Submission.submission_date.in_(dates),
+        Submission.submitted == True
+    ).group_by(Submission.submission_date).all())
+    counts = {_as_date(d): n for d, n in counts.items()}
+    finalized = {_as_date(d) for (d,) in db.query(PollDailySummary.summary_date).filter(
+        PollDailySummary.summary_date.in_(dates),
+        PollDailySummary.finalized == True)}
+    _upsert(db, PollDailySummary, [
+        {'summary_date': d, 'submitted_count': counts.get(d, 0), 'finalized': False}
+        for d in dates if d not in finalized
+    ], ['summary_date'], ['submitted_count'])
+
+
+def _add_to_daily_summary(db, deltas):
+    """Add {date: n} to the submitted counts in poll_daily_summary as atomic
+    increments, so concurrent writers never overwrite each other's counts.
+    n comes from the rowcounts of the writer's own statements. Finalized days
+    are left untouched."""
+    from sqlalchemy import case
+
+    summary = PollDailySummary.__table__
+    not_finalized = summary.c.finalized == False
+    increments = [{'summary_date': d, 'submitted_count': n, 'finalized': False}
+                  for d, n in sorted(deltas.items()) if n > 0]
+    for d, n in sorted(deltas.items()):
+        if n < 0:
+            db.execute(update(summary).where(summary.c.summary_date == d, not_finalized).values(
+                submitted_count=summary.c.submitted_count + n))
+    if not increments:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect == 'mysql':
+        stmt = mysql.insert(summary).values(increments)
+        stmt = stmt.on_duplicate_key_update(submitted_count=case(
+            (not_finalized, summary.c.submitted_count + stmt.inserted.submitted_count),
+            else_=summary.c.submitted_count))
+    elif dialect in ('sqlite', 'postgresql'):
+        dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        stmt = dialect_insert(summary).values(increments)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['summary_date'],
+            set_={'submitted_count': summary.c.submitted_count + stmt.excluded.submitted_count},
+            where=not_finalized)
+    else:
+        for row in increments:
+            existing = db.query(PollDailySummary).filter(
+                PollDailySummary.summary_date == row['summary_date']).with_for_update().first()
+            if existing is None:
+                db.add(PollDailySummary(**row))
+            elif not existing.finalized:
+                existing.submitted_count += row['submitted_count']
+        return
+    db.execute(stmt)
+
+
+def _removed_submission_deltas(db, *criteria):
+    """{date: -n} for the submitted rows matching criteria, taken before deleting them"""
+    from sqlalchemy import func
+    return {_as_date(d): -n for d, n in db.query(
+        Submission.submission_date,
+        func.count(Submission.id)
+    ).filter(Submission.submitted == True, *criteria).group_by(Submission.submission_date)}
+
+
+def _count_submitted(db, dates, locking=True):
+    """{date: submitted rows} for dates, read from the latest committed rows.
+    locking=False skips the locking read for dates nothing writes to any more."""
+    from sqlalchemy import func
+    query = db.query(
+        Submission.submission_date,
+        func.count(Submission.id)
+    ).filter(
+        Submission.submission_date.in_(dates),
+        Submission.submitted == True
+    ).group_by(Submission.submission_date)
+    if locking and db.get_bind().dialect.name == 'mysql':
+        # Locking read: counts the latest committed rows, not this transaction's
+        # REPEATABLE READ snapshot (which a rerun session may have taken long ago)
+        query = query.with_for_update()
+    return {_as_date(d): n for d, n in query.all()}
+
+
+def _finalize_daily_summaries(db, dates, poll_end_time=None, locking=True):
+    """Freeze the summary rows for dates with their final count and the roster size at close"""
+    dates = sorted({_as_date(d) for d in dates})
+    if not dates:
+        return
+    from sqlalchemy import func
+    counts = _count_submitted(db, dates, locking)
+    roster_size = db.query(func.count(User.id)).scalar() or 0
+    _upsert(db, PollDailySummary, [
+        {'summary_date': d, 'submitted_count': counts.get(d, 0), 'roster_size': roster_size,
+         'poll_end_time': poll_end_time, 'finalized': True}
+        for d in dates
+    ], ['summary_date'], ['submitted_count', 'roster_size', 'poll_end_time', 'finalized'])
+
+
+def finalize_poll_day(date_str):
+    """Record the final submitted count, roster size and end time for a poll day"""
+    db = _acquire_session()
+    try:
+        _finalize_daily_summaries(db, [date_str], get_poll_settings().poll_end_time)
+        _bump_data_version(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        _release_session(db)
+
+
+def finalize_due_poll_day():
+    """Finalize today's summary once the deadline has passed, unless it already is.
+    Called from the first rerun and the write-queue flush after the deadline;
+    remembered per settings version, so a reopened and re-closed day is
+    finalized again. Returns True if this call finalized it."""
+    settings = get_poll_settings()
+    # end_poll() finalizes a manually ended day itself
+    if settings.poll_manually_ended or is_poll_time_active():
+        return False
+    today = get_ist_date()
+    key = (today, settings.version)
+    with _finalized_days_lock:
+        if key in _finalized_days:
+            return False
+    db = _acquire_session()
+    try:
+        query = db.query(PollDailySummary.finalized).filter(PollDailySummary.summary_date == today)
+        if db.get_bind().dialect.name == 'mysql':
+            # Locking read, as in _finalize_daily_summaries: see a finalize committed
+            # by another process after this session's snapshot was taken
+            query = query.with_for_update()
+        finalized = query.scalar()
+        if not finalized:
+            _finalize_daily_summaries(db, [today], settings.poll_end_time)
+            _bump_data_version(db)
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        _release_session(db)
+    with _finalized_days_lock:
+        _finalized_days.add(key)
+    return not finalized
 
-        if submission:
-            submission.submitted = True
-        else:
-            submission = Submission(
-                user_id=user_id, submission_date=date_str, submitted=True)
-            db.add(submission)
 
+def _reopen_daily_summary(db, date):
+    # A reopened day takes submissions again and is finalized anew when it closes.
+    # Recount it, since writes made while it was finalized left the count alone
+    date = _as_date(date)
+    db.execute(update(PollDailySummary.__table__).where(
+        PollDailySummary.summary_date == date,
+        PollDailySummary.finalized == True
+    ).values(submitted_count=_count_submitted(db, [date]).get(date, 0),
+             finalized=False, roster_size=None, poll_end_time=None))
+
+
+def submit_poll(user_id, date_str):
+    submit_polls([(user_id, date_str)])
+
+
+def submit_polls(submissions):
+    """Record many submissions in one transaction with multi-row statements and
+    add the number that were new to each day's summary count.
+    submissions should be [(user_id, date_str), ...]"""
+    if not submissions:
+        return
+    db = _acquire_session()
+    try:
+        by_date = {}
+        for user_id, date_str in submissions:
+            by_date.setdefault(_as_date(date_str), set()).add(user_id)
+        deltas = {}
+        for date, user_ids in by_date.items():
+            for chunk in _chunks(sorted(user_ids), BULK_CHUNK_SIZE):
+                deltas[date] = deltas.get(date, 0) + _mark_submitted(db, date, chunk)
+        _add_to_daily_summary(db, deltas)
+        _bump_data_version(db)
         db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
-        db.close()
+        _release_session(db)
 
 
 def get_ist_date():
@@ -86,23 +591,98 @@ def get_ist_date():
 def is_poll_time_active():
     ist = pytz.timezone(IST_TZ)
     current_time = datetime.now(ist).time()
-    cutoff_time = datetime.strptime(get_poll_end_time(), '%H:%M').time()
-    return current_time < cutoff_time
-
-
-def clear_old_submissions():
-    db = SessionLocal()
+    return current_time < get_poll_settings().deadline
+
+
+def _archive_submissions(rows, archive_dir):
+    """Write one chunk of submissions to a zstd-compressed Parquet file named by its id range.
+    Rewriting the same chunk after an interrupted run overwrites the same file."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(archive_dir, exist_ok=True)
+    table = pa.table({
+        'id': [row.id for row in rows],
+        'user_id': [row.user_id for row in rows],
+        'submission_date': [_as_date(row.submission_date) for row in rows],
+        'submitted': [bool(row.submitted) for row in rows],
+    })
+    path = os.path.join(archive_dir, f"submissions_{rows[0].id:012d}_{rows[-1].id:012d}.parquet")
+    tmp_path = path + '.tmp'
+    pq.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+    return path
+
+
+def clear_old_submissions(retention_days=None, archive_dir=None, chunk_size=None, progress=None):
+    """Archive and delete submissions older than the retention window.
+    Rows are archived to Parquet (unless archive_dir is empty) and deleted in
+    primary-key chunks, each in its own short transaction, so an interrupted
+    run simply resumes with the rows that are left. Returns a stats dict."""
+    retention_days = RETENTION_DAYS if retention_days is None else retention_days
+    archive_dir = ARCHIVE_DIR if archive_dir is None else archive_dir
+    chunk_size = chunk_size or CLEANUP_CHUNK_SIZE
+    cutoff = get_ist_date() - timedelta(days=retention_days)
+    started = time.perf_counter()
+    stats = {'archived': 0, 'deleted': 0, 'files': [], 'seconds': 0.0}
+
+    db = _acquire_session()
     try:
-        current_ist_date = str(get_ist_date())
-        db.query(Submission).filter(
-            Submission.submission_date < current_ist_date).delete()
+        # Finalize any day that never got closed so its totals outlive the raw rows.
+        # Nothing writes to days past the cutoff, so each is a plain count in its
+        # own short transaction rather than one long locking read over all of them
+        old_dates = [d for (d,) in db.query(Submission.submission_date).filter(
+            Submission.submission_date < cutoff).distinct()]
+        closed = {_as_date(d) for (d,) in db.query(PollDailySummary.summary_date).filter(
+            PollDailySummary.summary_date < cutoff,
+            PollDailySummary.finalized == True)}
         db.commit()
+        for date in sorted({_as_date(d) for d in old_dates} - closed):
+            _finalize_daily_summaries(db, [date], locking=False)
+            db.commit()
+
+        while True:
+            rows = db.query(
+                Submission.id,
+                Submission.user_id,
+                Submission.submission_date,
+                Submission.submitted
+            ).filter(
+                Submission.submission_date < cutoff
+            ).order_by(Submission.id).limit(chunk_size).all()
+            if not rows:
+                break
+
+            if archive_dir:
+                stats['files'].append(_archive_submissions(rows, archive_dir))
+                stats['archived'] += len(rows)
+
+            deleted = db.query(Submission).filter(
+                Submission.id.between(rows[0].id, rows[-1].id),
+                Submission.submission_date < cutoff
+            ).delete(synchronize_session=False)
+            db.commit()
+            stats['deleted'] += deleted
+
+            if progress:
+                elapsed = time.perf_counter() - started
+                progress(stats['deleted'], stats['deleted'] / elapsed if elapsed else 0.0)
+
+        if stats['deleted']:
+            _bump_data_version(db)
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
-        db.close()
+        _release_session(db)
+
+    stats['seconds'] = time.perf_counter() - started
+    return stats
 
 
 def add_user(emp_id, emp_name):
-    db = SessionLocal()
+    db = _acquire_session()
     try:
         existing = db.query(User).filter(User.emp_id == emp_id).first()
         if existing:
@@ -110,30 +690,40 @@ def add_user(emp_id, emp_name):
 
         user = User(emp_id=emp_id, emp_name=emp_name)
         db.add(user)
+        _bump_data_version(db)
         db.commit()
+        invalidate_roster()
         return True
     except Exception:
+        db.rollback()
         return False
     finally:
-        db.close()
+        _release_session(db)
 
 
 def remove_user(emp_id):
-    db = SessionLocal()
+    db = _acquire_session()
     try:
         user = db.query(User).filter(User.emp_id == emp_id).first()
         if user:
+            deltas = _removed_submission_deltas(db, Submission.user_id == user.id)
             db.query(Submission).filter(Submission.user_id == user.id).delete()
             db.delete(user)
+            _add_to_daily_summary(db, deltas)
+            _bump_data_version(db)
             db.commit()
+            invalidate_roster()
             return True
         return False
+    except Exception:
+        db.rollback()
+        raise
     finally:
-        db.close()
+        _release_session(db)
 
 
 def get_poll_stats(date_str):
-    db = SessionLocal()
+    db = _acquire_session()
     try:
         from sqlalchemy import func
         stats = db.query(
@@ -143,232 +733,409 @@ def get_poll_stats(date_str):
         ).outerjoin(
             Submission,
             (User.id == Submission.user_id) & (
-                Submission.submission_date == date_str)
+                Submission.submission_date == _as_date(date_str))
         ).order_by(User.emp_id).all()
         return stats
     finally:
-        db.close()
+        _release_session(db)
 
 
 def end_poll(date_str):
-    db = SessionLocal()
+    db = _acquire_session()
     try:
+        # Close the day in the rollup before its raw rows are cleared
+        _finalize_daily_summaries(db, [date_str], get_poll_settings().poll_end_time)
         db.query(Submission).filter(
-            Submission.submission_date == date_str).delete()
+            Submission.submission_date == _as_date(date_str)).delete()
         # Mark poll as manually ended
         admin = db.query(AdminSettings).filter(AdminSettings.id == 1).first()
         if admin:
             admin.poll_manually_ended = True
+        _bump_data_version(db, settings=True)
         db.commit()
+        invalidate_poll_settings()
+    except Exception:
+        db.rollback()
+        raise
     finally:
-        db.close()
+        _release_session(db)
 
 
 def get_admin_password():
-    db = SessionLocal()
-    try:
-        admin = db.query(AdminSettings).filter(AdminSettings.id == 1).first()
-        return admin.password if admin else 'admin123'
-    finally:
-        db.close()
+    return get_poll_settings().password
 
 
 def update_admin_password(new_password):
-    db = SessionLocal()
+    db = _acquire_session()
     try:
         admin = db.query(AdminSettings).filter(AdminSettings.id == 1).first()
         if admin:
             admin.password = new_password
             db.commit()
+            invalidate_poll_settings()
+    except Exception:
+        db.rollback()
+        raise
     finally:
-        db.close()
+        _release_session(db)
+
+
+# Employee IDs are 32-bit integers, so at most 10 digits
+EMP_ID_MAX_DIGITS = 10
+
+
+def _emp_id_prefix_filter(prefix):
+    """emp_id ranges whose decimal digits start with prefix, e.g. "12" is 12,
+    120-129, 1200-1299, ...; index range scans instead of a CAST(...) LIKE scan"""
+    from sqlalchemy import false, or_
+
+    if not prefix.isdigit() or len(prefix) > EMP_ID_MAX_DIGITS or (prefix[0] == '0' and prefix != '0'):
+        return false()
+    value = int(prefix)
+    ranges = [User.emp_id == value]
+    if value:
+        for extra in range(1, EMP_ID_MAX_DIGITS - len(prefix) + 1):
+            scale = 10 ** extra
+            ranges.append(User.emp_id.between(value * scale, (value + 1) * scale - 1))
+    return or_(*ranges)
+
+
+def _user_status_query(db, date, status=None, search=''):
+    from sqlalchemy import or_
+
+    submitted = Submission.submitted == True
+    query = db.query(User.emp_id, User.emp_name, submitted.label('submitted')).outerjoin(
+        Submission, (User.id == Submission.user_id) & (Submission.submission_date == date))
+    if status == 'submitted':
+        query = query.filter(submitted)
+    elif status == 'pending':
+        query = query.filter(or_(Submission.id.is_(None), Submission.submitted == False))
+    search = search.strip()
+    if search:
+        # Prefix match on the name (ix_users_emp_name) or the digits of the employee ID
+        query = query.filter(or_(
+            User.emp_name.startswith(search, autoescape=True),
+            _emp_id_prefix_filter(search)))
+    return query
+
+
+def get_user_status_page(date_str, status=None, search='', after_emp_id=None, limit=None):
+    """One page of (emp_id, emp_name, submitted) ordered by emp_id, filtered in SQL.
+    status is None, 'submitted' or 'pending'; search is a name or emp_id prefix.
+    Keyset pagination: pass the last emp_id of a page as after_emp_id for the next.
+    Returns (rows, has_more); pages are cached until the data version moves."""
+    date = _as_date(date_str)
+    limit = limit or USER_PAGE_SIZE
+
+    def load():
+        db = _acquire_session()
+        try:
+            query = _user_status_query(db, date, status, search)
+            if after_emp_id is not None:
+                query = query.filter(User.emp_id > after_emp_id)
+            rows = query.order_by(User.emp_id).limit(limit + 1).all()
+        finally:
+            _release_session(db)
+        page = tuple((emp_id, emp_name, bool(submitted)) for emp_id, emp_name, submitted in rows)
+        return page[:limit], len(page) > limit
+
+    return _version_cached(
+        ('user_page', date, status, search.strip(), after_emp_id, limit), load)
+
+
+def count_user_status(date_str, status=None, search=''):
+    """Number of users matching the same filters as get_user_status_page"""
+    from sqlalchemy import func
+
+    date = _as_date(date_str)
+
+    def load():
+        db = _acquire_session()
+        try:
+            query = _user_status_query(db, date, status, search)
+            return query.with_entities(func.count(User.id)).scalar() or 0
+        finally:
+            _release_session(db)
+
+    return _version_cached(('user_count', date, status, search.strip()), load)
 
 
 def get_poll_end_time():
-    db = SessionLocal()
-    try:
-        admin = db.query(AdminSettings).filter(AdminSettings.id == 1).first()
-        return admin.poll_end_time if admin else '18:30'
-    finally:
-        db.close()
+    return get_poll_settings().poll_end_time
 
 
 def extend_poll(minutes):
-    current_end_time = get_poll_end_time()
-    current_dt = datetime.strptime(current_end_time, '%H:%M')
-    new_dt = current_dt + timedelta(minutes=minutes)
-    new_time = new_dt.strftime('%H:%M')
-
-    db = SessionLocal()
+    db = _acquire_session()
     try:
         admin = db.query(AdminSettings).filter(AdminSettings.id == 1).first()
+        current_end_time = admin.poll_end_time if admin and admin.poll_end_time else DEFAULT_POLL_END_TIME
+        current_dt = datetime.strptime(current_end_time, '%H:%M')
+        new_dt = current_dt + timedelta(minutes=minutes)
+        new_time = new_dt.strftime('%H:%M')
         if admin:
             admin.poll_end_time = new_time
+            if not admin.poll_manually_ended:
+                _reopen_daily_summary(db, get_ist_date())
+            _bump_data_version(db, settings=True)
             db.commit()
+        invalidate_poll_settings()
+    except Exception:
+        db.rollback()
+        raise
     finally:
-        db.close()
+        _release_session(db)
 
     return new_time
 
 
 def reset_poll_time():
-    db = SessionLocal()
+    db = _acquire_session()
     try:
         admin = db.query(AdminSettings).filter(AdminSettings.id == 1).first()
         if admin:
-            admin.poll_end_time = '18:30'
+            admin.poll_end_time = DEFAULT_POLL_END_TIME
+            if not admin.poll_manually_ended:
+                _reopen_daily_summary(db, get_ist_date())
+            _bump_data_version(db, settings=True)
             db.commit()
+        invalidate_poll_settings()
+    except Exception:
+        db.rollback()
+        raise
     finally:
-        db.close()
+        _release_session(db)
 
 
 def is_poll_manually_ended():
-    db = SessionLocal()
-    try:
-        admin = db.query(AdminSettings).filter(AdminSettings.id == 1).first()
-        return admin.poll_manually_ended if admin else False
-    finally:
-        db.close()
+    return get_poll_settings().poll_manually_ended
 
 
 def set_poll_manually_ended(ended=True):
-    db = SessionLocal()
+    db = _acquire_session()
     try:
         admin = db.query(AdminSettings).filter(AdminSettings.id == 1).first()
         if admin:
             admin.poll_manually_ended = ended
+            if not ended:
+                _reopen_daily_summary(db, get_ist_date())
+            _bump_data_version(db, settings=True)
             db.commit()
+        invalidate_poll_settings()
+    except Exception:
+        db.rollback()
+        raise
     finally:
-        db.close()
+        _release_session(db)
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
 
 
 def bulk_add_users(user_data_list):
-    """Add multiple users at once. user_data_list should be [(emp_id, emp_name), ...]"""
-    db = SessionLocal()
+    """Add multiple users at once. user_data_list should be [(emp_id, emp_name), ...]
+    Existing emp_ids are resolved with chunked IN queries and new rows are written
+    with chunked executemany inserts, all in one transaction."""
+    db = _acquire_session()
     try:
         added = []
         errors = []
 
+        # Drop duplicates inside the input itself, keeping the first occurrence
+        candidates = {}
         for emp_id, emp_name in user_data_list:
-            try:
-                existing = db.query(User).filter(User.emp_id == emp_id).first()
-                if existing:
-                    errors.append(f"{emp_id} (exists)")
-                    continue
-
-                user = User(emp_id=emp_id, emp_name=emp_name.strip())
-                db.add(user)
-                added.append((emp_id, emp_name))
-            except Exception as e:
-                errors.append(f"{emp_id} (error: {str(e)})")
+            if emp_id in candidates:
+                errors.append(f"{emp_id} (duplicate in input)")
+                continue
+            candidates[emp_id] = emp_name
+
+        emp_ids = list(candidates)
+        existing = set()
+        for chunk in _chunks(emp_ids, BULK_CHUNK_SIZE):
+            existing.update(emp_id for (emp_id,) in db.query(
+                User.emp_id).filter(User.emp_id.in_(chunk)))
+
+        rows = []
+        for emp_id in emp_ids:
+            if emp_id in existing:
+                errors.append(f"{emp_id} (exists)")
+                continue
+            rows.append({'emp_id': emp_id, 'emp_name': candidates[emp_id].strip()})
+            added.append((emp_id, candidates[emp_id]))
+
+        for chunk in _chunks(rows, BULK_CHUNK_SIZE):
+            db.execute(insert(User), chunk)
 
         if added:
+            _bump_data_version(db)
             db.commit()
+            invalidate_roster()
 
         return added, errors
     except Exception:
         db.rollback()
         return [], ["Database error occurred"]
     finally:
-        db.close()
+        _release_session(db)
+
+
+RosterDiff = namedtuple('RosterDiff', ['adds', 'renames', 'removals'])
+
+
+def compute_roster_diff(roster):
+    """Diff a full roster {emp_id: emp_name} against the users table.
+    Returns RosterDiff(adds=[(emp_id, name)], renames=[(emp_id, old_name, new_name)],
+    removals=[(emp_id, name)])"""
+    db = _acquire_session()
+    try:
+        current = {emp_id: emp_name for emp_id, emp_name in db.query(User.emp_id, User.emp_name)}
+    finally:
+        _release_session(db)
+
+    adds = sorted((emp_id, roster[emp_id]) for emp_id in roster.keys() - current.keys())
+    removals = sorted((emp_id, current[emp_id]) for emp_id in current.keys() - roster.keys())
+    renames = sorted(
+        (emp_id, current[emp_id], roster[emp_id])
+        for emp_id in roster.keys() & current.keys()
+        if roster[emp_id] != current[emp_id]
+    )
+    return RosterDiff(adds=adds, renames=renames, removals=removals)
+
+
+def apply_roster_diff(diff, apply_removals=True):
+    """Apply a RosterDiff in a single transaction using chunked bulk statements"""
+    db = _acquire_session()
+    try:
+        for chunk in _chunks(diff.adds, BULK_CHUNK_SIZE):
+            db.execute(insert(User), [
+                {'emp_id': emp_id, 'emp_name': emp_name} for emp_id, emp_name in chunk])
+
+        for chunk in _chunks(diff.renames, BULK_CHUNK_SIZE):
+            # Core table update so the parameter list runs as one executemany
+            users = User.__table__
+            db.execute(
+                update(users).where(users.c.emp_id == bindparam('b_emp_id')).values(
+                    emp_name=bindparam('b_emp_name')),
+                [{'b_emp_id': emp_id, 'b_emp_name': new_name} for emp_id, _, new_name in chunk])
+
+        if apply_removals:
+            deltas = {}
+            for chunk in _chunks([emp_id for emp_id, _ in diff.removals], BULK_CHUNK_SIZE):
+                user_ids = db.query(User.id).filter(User.emp_id.in_(chunk)).scalar_subquery()
+                for d, n in _removed_submission_deltas(db, Submission.user_id.in_(user_ids)).items():
+                    deltas[d] = deltas.get(d, 0) + n
+                db.query(Submission).filter(Submission.user_id.in_(
+                    user_ids)).delete(synchronize_session=False)
+                db.query(User).filter(User.emp_id.in_(chunk)).delete(
+                    synchronize_session=False)
+            _add_to_daily_summary(db, deltas)
+
+        _bump_data_version(db)
+        db.commit()
+        invalidate_roster()
+        return True
+    except Exception:
+        db.rollback()
+        return False
+    finally:
+        _release_session(db)
 
 
 def get_user_by_emp_id(emp_id):
-    """Get user details by employee ID"""
-    db = SessionLocal()
+    """Get user details by employee ID from the roster index"""
+    found = get_roster_index().get(emp_id)
+    if found:
+        return {'id': found[0], 'emp_id': emp_id, 'emp_name': found[1]}
+
+    # Not in this process's roster; it may have been added elsewhere since
+    db = _acquire_session()
     try:
         user = db.query(User).filter(User.emp_id == emp_id).first()
         if user:
+            invalidate_roster()
             return {'id': user.id, 'emp_id': user.emp_id, 'emp_name': user.emp_name}
         return None
     finally:
-        db.close()
+        _release_session(db)
 
 
 def reset_poll_submissions(date_str):
     """Reset all poll submissions for a specific date"""
-    db = SessionLocal()
+    db = _acquire_session()
     try:
-        # Delete all submissions for the given date
+        # Delete all submissions for the given date, including its rollup row
         db.query(Submission).filter(
-            Submission.submission_date == date_str).delete()
+            Submission.submission_date == _as_date(date_str)).delete()
+        db.query(PollDailySummary).filter(
+            PollDailySummary.summary_date == _as_date(date_str)).delete()
 
         # Reset poll manually ended flag
         admin = db.query(AdminSettings).filter(AdminSettings.id == 1).first()
         if admin:
             admin.poll_manually_ended = False
 
+        _bump_data_version(db, settings=True)
         db.commit()
+        invalidate_poll_settings()
         return True
     except Exception:
         db.rollback()
         return False
     finally:
-        db.close()
+        _release_session(db)
 
 
 def reset_user_submission(user_id, date_str):
     """Reset a specific user's submission for a date"""
-    db = SessionLocal()
+    db = _acquire_session()
     try:
-        # First check if submission exists
-        submission = db.query(Submission).filter(
+        # Single DELETE; the unique (user_id, submission_date) index means at
+        # most one row matches, so rowcount tells us whether anything was reset
+        # and is exactly what comes off the day's summary count
+        deleted = db.query(Submission).filter(
             Submission.user_id == user_id,
-            Submission.submission_date == date_str
-        ).first()
-        
-        if submission:
-            # Delete the submission record
-            db.delete(submission)
-            db.commit()
-            
-            # Verify deletion was successful
-            verify_submission = db.query(Submission).filter(
-                Submission.user_id == user_id,
-                Submission.submission_date == date_str
-            ).first()
-            
-            return verify_submission is None
-        else:
-            # No submission found to reset
-            return False
-    except Exception as e:
+            Submission.submission_date == _as_date(date_str),
+            Submission.submitted == True
+        ).delete(synchronize_session=False)
+        _add_to_daily_summary(db, {_as_date(date_str): -deleted})
+        _bump_data_version(db)
+        db.commit()
+        return deleted > 0
+    except Exception:
         db.rollback()
         return False
     finally:
-        db.close()
+        _release_session(db)
 
 
 def get_poll_history(days=7):
-    """Get poll history for the last N days"""
-    db = SessionLocal()
+    """Get poll history for the last N days from the daily rollup"""
+    db = _acquire_session()
     try:
-        from sqlalchemy import func, desc
+        from sqlalchemy import desc
 
-        # Get submission counts by date
         history = db.query(
-            Submission.submission_date,
-            func.count(Submission.id).label('total_submissions')
+            PollDailySummary.summary_date,
+            PollDailySummary.submitted_count.label('total_submissions')
         ).filter(
-            Submission.submitted == True
-        ).group_by(
-            Submission.submission_date
+            PollDailySummary.submitted_count > 0
         ).order_by(
-            desc(Submission.submission_date)
+            desc(PollDailySummary.summary_date)
         ).limit(days).all()
 
         return history
     finally:
-        db.close()
+        _release_session(db)
 
 
 def get_user_submission_history(emp_id, days=30):
     """Get submission history for a specific user"""
-    db = SessionLocal()
+    db = _acquire_session()
     try:
         from sqlalchemy import desc
 
-        user = db.query(User).filter(User.emp_id == emp_id).first()
+        user = get_user_by_emp_id(emp_id)
         if not user:
             return []
 
@@ -376,19 +1143,19 @@ def get_user_submission_history(emp_id, days=30):
             Submission.submission_date,
             Submission.submitted
         ).filter(
-            Submission.user_id == user.id
+            Submission.user_id == user['id']
         ).order_by(
             desc(Submission.submission_date)
         ).limit(days).all()
 
         return history
     finally:
-        db.close()
+        _release_session(db)
 
 
 def export_poll_data(date_str):
     """Export poll data for a specific date"""
-    db = SessionLocal()
+    db = _acquire_session()
     try:
         from sqlalchemy import func
 
@@ -399,44 +1166,125 @@ def export_poll_data(date_str):
         ).outerjoin(
             Submission,
             (User.id == Submission.user_id) & (
-                Submission.submission_date == date_str)
+                Submission.submission_date == _as_date(date_str))
         ).order_by(User.emp_id).all()
 
         return data
     finally:
-        db.close()
+        _release_session(db)
 
 
-def get_admin_dashboard_stats():
-    """Get comprehensive stats for admin dashboard"""
-    db = SessionLocal()
-    try:
-        from sqlalchemy import func, distinct
+def iter_poll_export(start_date, end_date, emp_id=None, batch_size=None):
+    """Yield batches of (date, emp_id, emp_name, submitted) for every user and
+    every day in [start_date, end_date], streamed from a server-side cursor"""
+    from sqlalchemy import func, select
 
-        # Total users
-        total_users = db.query(func.count(User.id)).scalar()
-
-        # Today's submissions
-        today = str(get_ist_date())
-        today_submissions = db.query(func.count(Submission.id)).filter(
-            Submission.submission_date == today,
-            Submission.submitted == True
-        ).scalar()
-
-        # Total submissions ever
-        total_submissions = db.query(func.count(Submission.id)).filter(
-            Submission.submitted == True
-        ).scalar()
-
-        # Active days (days with at least one submission)
-        active_days = db.query(func.count(distinct(Submission.submission_date))).filter(
-            Submission.submitted == True
-        ).scalar()
+    batch_size = batch_size or EXPORT_BATCH_SIZE
+    day = _as_date(start_date)
+    end = _as_date(end_date)
+    db = _acquire_session()
+    try:
+        while day <= end:
+            stmt = select(
+                User.emp_id,
+                User.emp_name,
+                func.coalesce(Submission.submitted, 0).label('submitted')
+            ).select_from(User).outerjoin(
+                Submission,
+                (User.id == Submission.user_id) & (
+                    Submission.submission_date == day)
+            ).order_by(User.emp_id)
+            if emp_id is not None:
+                stmt = stmt.where(User.emp_id == emp_id)
+
+            result = db.execute(stmt, execution_options={
+                'stream_results': True, 'yield_per': batch_size})
+            for partition in result.partitions():
+                yield [(day, row_emp_id, emp_name, bool(submitted))
+                       for row_emp_id, emp_name, submitted in partition]
+            day += timedelta(days=1)
+    finally:
+        _release_session(db)
+
+
+def export_poll_range(fileobj, start_date, end_date, fmt='csv', emp_id=None):
+    """Write poll data for a date range to a binary file object as CSV or Parquet,
+    one batch at a time. Returns the number of rows written."""
+    written = 0
+    batches = iter_poll_export(start_date, end_date, emp_id=emp_id)
+    if fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            ('Date', pa.date32()),
+            ('Employee ID', pa.int64()),
+            ('Employee Name', pa.string()),
+            ('Submitted', pa.bool_()),
+            ('Status', pa.string()),
+        ])
+        with pq.ParquetWriter(fileobj, schema, compression='zstd') as writer:
+            for batch in batches:
+                columns = list(zip(*batch))
+                writer.write_table(pa.table({
+                    'Date': columns[0],
+                    'Employee ID': columns[1],
+                    'Employee Name': columns[2],
+                    'Submitted': columns[3],
+                    'Status': ['Submitted' if s else 'Pending' for s in columns[3]],
+                }, schema=schema))
+                written += len(batch)
+        return written
+
+    import csv
+    import io
+
+    text = io.TextIOWrapper(fileobj, encoding='utf-8', newline='')
+    writer = csv.writer(text)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows(
+            (day, emp_id, emp_name, submitted, 'Submitted' if submitted else 'Pending')
+            for day, emp_id, emp_name, submitted in batch)
+        written += len(batch)
+    text.flush()
+    text.detach()
+    return written
+
+
+def get_admin_dashboard_stats(today=None):
+    """Get comprehensive stats for admin dashboard in one aggregate query over
+    the daily rollup, cached for DASHBOARD_CACHE_TTL seconds per data version"""
+    today = _as_date(today) if today else get_ist_date()
+    key = (get_data_version(), today)
+    with _dashboard_cache_lock:
+        cached = _dashboard_cache.get('stats')
+        if cached and cached[0] == key and time.monotonic() - cached[1] < DASHBOARD_CACHE_TTL:
+            return dict(cached[2])
+
+    db = _acquire_session()
+    try:
+        from sqlalchemy import func, case, select
+
+        total_users = select(func.count(User.id)).scalar_subquery()
+        row = db.query(
+            total_users.label('total_users'),
+            # Today's submissions
+            func.sum(case((PollDailySummary.summary_date == today,
+                           PollDailySummary.submitted_count), else_=0)),
+            # Total submissions ever
+            func.sum(PollDailySummary.submitted_count),
+            # Active days (days with at least one submission)
+            func.count(PollDailySummary.summary_date)
+        ).select_from(PollDailySummary).filter(
+            PollDailySummary.submitted_count > 0
+        ).one()
+        total_users, today_submissions, total_submissions, active_days = row
 
         # Average daily participation
-        avg_participation = total_submissions / active_days if active_days > 0 else 0
+        avg_participation = total_submissions / active_days if active_days else 0
 
-        return {
+        stats = {
             'total_users': total_users or 0,
             'today_submissions': today_submissions or 0,
             'total_submissions': total_submissions or 0,
@@ -444,4 +1292,8 @@ def get_admin_dashboard_stats():
             'avg_participation': round(avg_participation, 2)
         }
     finally:
-        db.close()
+        _release_session(db)
+
+    with _dashboard_cache_lock:
+        _dashboard_cache['stats'] = (key, time.monotonic(), stats)
+    return dict(stats)
@@ -0,0 +1,230 @@
+"""Deadline-rush load test.
+
+Simulates employees arriving on a curve that peaks at the poll deadline. Each
+one loads the User view (settings, roster and status map in one rerun
+session), submits through database.submit_poll and, with --reset-ratio,
+sometimes resets through database.reset_user_submission. Runs against a
+throwaway SQLite database unless --url is given.
+
+    python loadtest.py --employees 500 --concurrency 50 --duration 30
+    python loadtest.py --employees 2000 --mode process --workers 4 --output load.json
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+import database
+import write_queue
+from benchmark import percentile
+from models import Base, SessionLocal, create_db_engine
+
+# Substrings of driver errors that mean the statement gave up waiting on a lock
+LOCK_ERRORS = ('database is locked', 'Lock wait timeout', 'Deadlock found')
+
+
+def innodb_lock_stats(engine):
+    """(row lock waits, ms spent waiting) from InnoDB's server-wide counters, or
+    None where the backend does not count waits that later succeed (SQLite's
+    busy timeout is not observable from Python)"""
+    if engine.dialect.name != 'mysql':
+        return None
+    with engine.connect() as conn:
+        status = dict(conn.execute(text("SHOW GLOBAL STATUS LIKE 'Innodb_row_lock_%'")).all())
+    return int(status['Innodb_row_lock_waits']), int(status['Innodb_row_lock_time'])
+
+
+def arrival_times(count, duration, curve, scale, seed_value):
+    """Seconds from start at which each employee arrives; `exponential` bunches them up at the end"""
+    rng = random.Random(seed_value)
+    if curve == 'uniform':
+        times = [rng.uniform(0, duration) for _ in range(count)]
+    else:
+        # Time before the deadline is exponential, so arrivals peak right at the deadline
+        times = [max(0.0, duration - min(duration, rng.expovariate(1 / (duration * scale))))
+                 for _ in range(count)]
+    return sorted(times)
+
+
+def bind(url):
+    engine = create_db_engine(url)
+    SessionLocal.configure(bind=engine)
+    return engine
+
+
+def simulate_employee(user_id, today, reset_ratio, use_queue, rng):
+    """One employee's visit; returns ([(operation, ms)], [error kinds])"""
+    timings = []
+    errors = []
+
+    def timed(operation, func):
+        started = time.perf_counter()
+        try:
+            func()
+        except OperationalError as e:
+            errors.append('lock_error' if any(m in str(e) for m in LOCK_ERRORS) else 'operational')
+        except Exception as e:
+            errors.append(type(e).__name__)
+        finally:
+            timings.append((operation, (time.perf_counter() - started) * 1000))
+
+    def load_user_view():
+        with database.rerun_session():
+            database.get_poll_settings()
+            database.get_users()
+            database.get_submission_status_map(today)
+
+    def reset():
+        # Same order as app.py: drop a still-queued submission, then the stored one
+        write_queue.discard(user_id, today)
+        database.reset_user_submission(user_id, today)
+
+    submit = write_queue.submit_poll if use_queue else database.submit_poll
+    timed('load_user_view', load_user_view)
+    timed('submit_poll', lambda: submit(user_id, today))
+    if rng.random() < reset_ratio:
+        timed('reset_user_submission', reset)
+        timed('submit_poll', lambda: submit(user_id, today))
+    return timings, errors
+
+
+def run_schedule(url, schedule, today, args, seed_value):
+    """Run [(arrival_seconds, user_id)] on a thread pool; used directly and per process"""
+    if url:
+        bind(url)
+    if args.queue:
+        write_queue.WRITE_QUEUE_ENABLED = True
+        write_queue.WRITE_QUEUE_JOURNAL = os.path.join(
+            tempfile.mkdtemp(prefix='dps-queue-'), 'write_queue.journal')
+    rng = random.Random(seed_value)
+    rng_lock = threading.Lock()
+    start = time.perf_counter()
+
+    def visit(item):
+        arrival, user_id = item
+        delay = arrival - (time.perf_counter() - start)
+        if delay > 0:
+            time.sleep(delay)
+        with rng_lock:
+            employee_rng = random.Random(rng.random())
+        return simulate_employee(user_id, today, args.reset_ratio, args.queue, employee_rng)
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(visit, schedule))
+    if args.queue:
+        write_queue.get_queue().close()
+    return results
+
+
+def _process_worker(payload):
+    url, schedule, today, args, seed_value = payload
+    return run_schedule(url, schedule, today, args, seed_value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=50, help='Threads per worker')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds until the deadline')
+    parser.add_argument('--curve', choices=['exponential', 'uniform'], default='exponential')
+    parser.add_argument('--scale', type=float, default=0.15,
+                        help='Exponential curve spread as a fraction of --duration')
+    parser.add_argument('--reset-ratio', type=float, default=0.05)
+    parser.add_argument('--mode', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2,
+                        help='Processes in --mode process')
+    parser.add_argument('--queue', action='store_true', help='Submit through write_queue')
+    parser.add_argument('--url', help='Database URL (default: throwaway SQLite file)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the report to this JSON file')
+    parser.add_argument('--max-p95-ms', type=float,
+                        help='Exit non-zero when submit_poll p95 exceeds this')
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='dps-load-'), 'load.db')}"
+    engine = bind(url)
+    Base.metadata.create_all(bind=engine)
+    database.init_db(migrate=False)
+    database.bulk_add_users([(100000 + i, f"Employee {i}") for i in range(args.employees)])
+    user_ids = [uid for uid, _, _ in database.get_users()][:args.employees]
+    today = str(database.get_ist_date())
+
+    times = arrival_times(len(user_ids), args.duration, args.curve, args.scale, args.seed)
+    schedule = list(zip(times, random.Random(args.seed).sample(user_ids, len(user_ids))))
+
+    locks_before = innodb_lock_stats(engine)
+    started = time.perf_counter()
+    if args.mode == 'process':
+        engine.dispose()
+        parts = [(url, schedule[i::args.workers], today, args, args.seed + i)
+                 for i in range(args.workers)]
+        with multiprocessing.Pool(args.workers) as pool:
+            results = [r for part in pool.map(_process_worker, parts) for r in part]
+    else:
+        results = run_schedule(None, schedule, today, args, args.seed)
+    elapsed = time.perf_counter() - started
+    locks_after = innodb_lock_stats(engine)
+
+    latencies = defaultdict(list)
+    errors = Counter()
+    for timings, visit_errors in results:
+        for operation, ms in timings:
+            latencies[operation].append(ms)
+        errors.update(visit_errors)
+
+    # Busiest second of arrivals, to show how sharp the peak was
+    peak_arrivals = max(Counter(math.floor(t) for t in times).values()) if times else 0
+    report = {
+        'params': {k: v for k, v in vars(args).items() if k != 'output'},
+        'elapsed_s': round(elapsed, 3),
+        'peak_arrivals_per_s': peak_arrivals,
+        'operations': {
+            operation: {
+                'count': len(samples),
+                'throughput_per_s': round(len(samples) / elapsed, 2),
+                'p50_ms': round(percentile(samples, 50), 3),
+                'p95_ms': round(percentile(samples, 95), 3),
+                'p99_ms': round(percentile(samples, 99), 3),
+                'max_ms': round(max(samples), 3),
+            } for operation, samples in latencies.items()
+        },
+        # Statements that waited on a row lock, whether or not they then succeeded;
+        # server-wide, so other clients of a shared --url database are included
+        'lock_waits': locks_after[0] - locks_before[0] if locks_after else None,
+        'lock_wait_ms': locks_after[1] - locks_before[1] if locks_after else None,
+        'lock_errors': errors.pop('lock_error', 0),
+        'errors': dict(errors),
+        'submitted': len(database.get_submission_status_map(today)),
+    }
+
+    print(f"{args.employees} employees in {elapsed:.1f}s ({args.mode}, peak {peak_arrivals}/s)")
+    for operation, stats in report['operations'].items():
+        print(f"{operation:<24} {stats['count']:>6}  {stats['throughput_per_s']:>8.1f}/s  "
+              f"p50 {stats['p50_ms']:>8.2f} ms  p95 {stats['p95_ms']:>8.2f} ms  "
+              f"p99 {stats['p99_ms']:>8.2f} ms")
+    lock_waits = ('n/a (MySQL only)' if report['lock_waits'] is None
+                  else f"{report['lock_waits']} ({report['lock_wait_ms']} ms)")
+    print(f"lock waits: {lock_waits}  lock errors: {report['lock_errors']}  "
+          f"errors: {report['errors'] or 'none'}  submitted: {report['submitted']}/{len(user_ids)}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    submit_p95 = report['operations'].get('submit_poll', {}).get('p95_ms', 0)
+    if args.max_p95_ms is not None and (
+            submit_p95 > args.max_p95_ms or report['errors'] or report['lock_errors']):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
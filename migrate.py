@@ -0,0 +1,9 @@
+import time
+from database import init_db
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    init_db()
+    elapsed = time.perf_counter() - started
+    print(f"Migrations applied in {elapsed * 1000:.1f} ms")
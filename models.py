@@ -1,8 +1,11 @@
 import os
-from sqlalchemy import Column, Integer, String, Boolean, Date, ForeignKey, create_engine
+from sqlalchemy import Column, BigInteger, Integer, String, Boolean, Date, ForeignKey, Index, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from dotenv import load_dotenv
+import query_stats
 
 # Load environment variables
 load_dotenv()
@@ -12,6 +15,9 @@ Base = declarative_base()
 
 class User(Base):
     __tablename__ = 'users'
+    __table_args__ = (
+        Index('ix_users_emp_name', 'emp_name'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     emp_id = Column(Integer, unique=True, nullable=False)
@@ -22,6 +28,11 @@ class User(Base):
 
 class Submission(Base):
     __tablename__ = 'submissions'
+    __table_args__ = (
+        Index('uq_submissions_user_date', 'user_id',
+              'submission_date', unique=True),
+        Index('ix_submissions_submission_date', 'submission_date'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey('users.id'))
@@ -31,6 +42,26 @@ class Submission(Base):
     user = relationship("User", back_populates="submissions")
 
 
+class PollDailySummary(Base):
+    __tablename__ = 'poll_daily_summary'
+
+    summary_date = Column(Date, primary_key=True)
+    submitted_count = Column(Integer, nullable=False, default=0)
+    roster_size = Column(Integer)
+    poll_end_time = Column(String(5))
+    finalized = Column(Boolean, nullable=False, default=False)
+
+
+class PollState(Base):
+    __tablename__ = 'poll_state'
+
+    # Single row (id=1); data_version goes up with every change to users or submissions,
+    # settings_version with every change to the poll end time or manual end flag
+    id = Column(Integer, primary_key=True)
+    data_version = Column(BigInteger, nullable=False, default=0)
+    settings_version = Column(BigInteger, nullable=False, default=0)
+
+
 class AdminSettings(Base):
     __tablename__ = 'admin_settings'
 
@@ -49,7 +80,77 @@ DB_PORT = os.getenv('DB_PORT', '3306')
 
 # MySQL connection string
 DATABASE_URL = f"mysql+pymysql://{DB_USERNAME}:{DB_PWD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL, echo=False)
+
+# DATABASE_URL overrides the DB_* variables, e.g. sqlite:///dinner_poll.db for local use
+DATABASE_URL = os.getenv('DATABASE_URL') or DATABASE_URL
+
+# Connection pool tuning; pool_recycle stays below MySQL's default 8h wait_timeout
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '1') == '1'
+DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', '10'))
+DB_POOL_WARMUP = int(os.getenv('DB_POOL_WARMUP', '0'))
+SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000'))
+
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    # WAL lets readers proceed while a writer commits; NORMAL is durable enough under WAL
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+    cursor.close()
+
+
+def _create_sqlite_engine(url):
+    if url.database in (None, '', ':memory:'):
+        # One shared connection, otherwise every connection gets its own empty database
+        engine = create_engine(url, echo=False, poolclass=StaticPool,
+                               connect_args={'check_same_thread': False})
+    else:
+        engine = create_engine(
+            url,
+            echo=False,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            connect_args={'check_same_thread': False,
+                          'timeout': SQLITE_BUSY_TIMEOUT / 1000}
+        )
+    event.listen(engine, 'connect', _configure_sqlite)
+    return engine
+
+
+def create_db_engine(url=DATABASE_URL):
+    """Build the engine shared by the app, the cleanup job and Alembic"""
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite':
+        return _create_sqlite_engine(url)
+    return create_engine(
+        url,
+        echo=False,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args={'connect_timeout': DB_CONNECT_TIMEOUT}
+    )
+
+
+def warm_up_pool(connections=DB_POOL_WARMUP):
+    """Open `connections` pooled connections up front so the first requests don't pay for them"""
+    connections = min(connections, DB_POOL_SIZE)
+    opened = [engine.connect() for _ in range(connections)]
+    for connection in opened:
+        connection.close()
+    return len(opened)
+
+
+engine = create_db_engine()
+query_stats.install(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -0,0 +1,138 @@
+"""Opt-in per-rerun profiler for app.py.
+
+Enable with PROFILE_RERUNS=1 (every rerun) or the ?profile=1 query parameter
+(that browser session only). app.py calls mark("name") at the start of each
+section; a section runs until the next mark. Each rerun's section timings,
+plus the top cProfile entries when PROFILE_CPROFILE=1, are appended as one
+JSON line to a rotating PROFILE_LOG file.
+
+    python profiler.py            # slowest sections across the logged reruns
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+
+PROFILE_RERUNS = os.getenv('PROFILE_RERUNS', '0') == '1'
+PROFILE_CPROFILE = os.getenv('PROFILE_CPROFILE', '0') == '1'
+PROFILE_LOG = os.getenv('PROFILE_LOG', 'profile.log')
+PROFILE_LOG_BYTES = int(os.getenv('PROFILE_LOG_BYTES', str(5 * 1024 * 1024)))
+PROFILE_LOG_BACKUPS = int(os.getenv('PROFILE_LOG_BACKUPS', '3'))
+PROFILE_HISTORY = int(os.getenv('PROFILE_HISTORY', '50'))
+CPROFILE_TOP = 25
+
+_current = ContextVar('profiled_rerun', default=None)
+_history_lock = threading.Lock()
+_history = deque(maxlen=PROFILE_HISTORY)
+_log = logging.getLogger('dps.profiler')
+
+
+def _logger():
+    if not _log.handlers:
+        handler = RotatingFileHandler(
+            PROFILE_LOG, maxBytes=PROFILE_LOG_BYTES, backupCount=PROFILE_LOG_BACKUPS)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _log.addHandler(handler)
+        _log.setLevel(logging.INFO)
+        _log.propagate = False
+    return _log
+
+
+def begin_rerun(enabled=False):
+    """Start timing this rerun if profiling is enabled by env var or by the caller"""
+    if not (enabled or PROFILE_RERUNS):
+        _current.set(None)
+        return
+    profile = None
+    if PROFILE_CPROFILE:
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            profile = None
+    _current.set({
+        'started': time.time(),
+        'sections': [],
+        'section': None,
+        'section_started': time.perf_counter(),
+        'rerun_started': time.perf_counter(),
+        'profile': profile,
+    })
+
+
+def mark(name):
+    """Close the running section and start timing `name`"""
+    rerun = _current.get()
+    if rerun is None:
+        return
+    now = time.perf_counter()
+    if rerun['section'] is not None:
+        rerun['sections'].append((rerun['section'], (now - rerun['section_started']) * 1000))
+    rerun['section'] = name
+    rerun['section_started'] = now
+
+
+def end_rerun():
+    """Close the last section and write the rerun to the profile log"""
+    rerun = _current.get()
+    if rerun is None:
+        return None
+    mark(None)
+    _current.set(None)
+
+    record = {
+        'started': rerun['started'],
+        'total_ms': round((time.perf_counter() - rerun['rerun_started']) * 1000, 3),
+        'sections': {name: round(ms, 3) for name, ms in rerun['sections']},
+    }
+    if rerun['profile'] is not None:
+        rerun['profile'].disable()
+        out = io.StringIO()
+        pstats.Stats(rerun['profile'], stream=out).sort_stats('cumulative').print_stats(CPROFILE_TOP)
+        record['cprofile'] = out.getvalue()
+
+    with _history_lock:
+        _history.append(record)
+    _logger().info(json.dumps(record))
+    return record
+
+
+def slowest_sections(records=None, limit=10):
+    """[(section, reruns, mean_ms, max_ms)] across recent reruns, slowest mean first"""
+    if records is None:
+        with _history_lock:
+            records = list(_history)
+    totals = {}
+    for record in records:
+        for name, ms in record['sections'].items():
+            count, total, worst = totals.get(name, (0, 0.0, 0.0))
+            totals[name] = (count + 1, total + ms, max(worst, ms))
+    summary = [(name, count, total / count, worst) for name, (count, total, worst) in totals.items()]
+    summary.sort(key=lambda item: item[2], reverse=True)
+    return summary[:limit]
+
+
+def _read_log(path):
+    records = []
+    for candidate in [path] + [f"{path}.{i}" for i in range(1, PROFILE_LOG_BACKUPS + 1)]:
+        if os.path.exists(candidate):
+            with open(candidate) as f:
+                records.extend(json.loads(line) for line in f if line.strip())
+    return records
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else PROFILE_LOG
+    records = _read_log(path)
+    print(f"{len(records)} profiled reruns in {path}")
+    for name, count, mean_ms, max_ms in slowest_sections(records, limit=20):
+        print(f"{name:<32} {count:>5} reruns  mean {mean_ms:>9.2f} ms  max {max_ms:>9.2f} ms")
@@ -0,0 +1,123 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+PERF_HISTORY = int(os.getenv('PERF_HISTORY', '20'))
+SLOWEST_PER_RERUN = 5
+SLOW_QUERY_LOG = os.getenv('SLOW_QUERY_LOG', '')
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '100'))
+
+_current_rerun = ContextVar('current_rerun', default=None)
+_history_lock = threading.Lock()
+_history = deque(maxlen=PERF_HISTORY)
+_installed = set()
+
+_slow_log = logging.getLogger('dps.slow_queries')
+if SLOW_QUERY_LOG:
+    _handler = logging.FileHandler(SLOW_QUERY_LOG)
+    _handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+    _slow_log.addHandler(_handler)
+    _slow_log.setLevel(logging.INFO)
+    _slow_log.propagate = False
+
+
+def _calling_function():
+    """Name of the outermost public database.py function on the stack"""
+    function = '(other)'
+    frame = sys._getframe(2)
+    while frame is not None:
+        name = frame.f_code.co_name
+        if frame.f_globals.get('__name__') == 'database' and name[0] not in '_<':
+            function = name
+        frame = frame.f_back
+    return function
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info['query_start_time'].pop()) * 1000
+    rerun = _current_rerun.get()
+    if rerun is None and not SLOW_QUERY_LOG:
+        return
+
+    function = _calling_function()
+    if rerun is not None:
+        rerun['queries'] += 1
+        rerun['db_ms'] += elapsed_ms
+        count, total = rerun['functions'].get(function, (0, 0.0))
+        rerun['functions'][function] = (count + 1, total + elapsed_ms)
+        rerun['slowest'].append((elapsed_ms, function, statement))
+        rerun['slowest'].sort(key=lambda item: item[0], reverse=True)
+        del rerun['slowest'][SLOWEST_PER_RERUN:]
+    if SLOW_QUERY_LOG and elapsed_ms >= SLOW_QUERY_MS:
+        _slow_log.info("%.1fms %s %s", elapsed_ms, function, ' '.join(statement.split()))
+
+
+def install(engine):
+    """Attach the timing hooks to an engine (once)"""
+    if id(engine) in _installed:
+        return
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    _installed.add(id(engine))
+
+
+def begin_rerun(label=''):
+    """Start collecting query stats for the current Streamlit rerun"""
+    _current_rerun.set({
+        'label': label,
+        'started': time.time(),
+        'started_perf': time.perf_counter(),
+        'queries': 0,
+        'db_ms': 0.0,
+        'functions': {},
+        'slowest': [],
+    })
+
+
+def label_rerun(label):
+    """Tag the current rerun, e.g. with the view being rendered"""
+    rerun = _current_rerun.get()
+    if rerun is not None:
+        rerun['label'] = label
+
+
+def end_rerun():
+    """Finish the current rerun and add it to the recent history"""
+    rerun = _current_rerun.get()
+    if rerun is None:
+        return None
+    _current_rerun.set(None)
+    rerun['total_ms'] = (time.perf_counter() - rerun.pop('started_perf')) * 1000
+    with _history_lock:
+        _history.append(rerun)
+    return rerun
+
+
+@contextmanager
+def rerun_scope(label):
+    """Record a fragment rerun on its own, or fold into the full rerun already being recorded"""
+    if _current_rerun.get() is not None:
+        yield
+        return
+    begin_rerun(label)
+    try:
+        yield
+    finally:
+        end_rerun()
+
+
+def recent_reruns():
+    """The last PERF_HISTORY reruns, newest first"""
+    with _history_lock:
+        return list(reversed(_history))
@@ -1,9 +1,12 @@
 // Enhanced Timer Functionality for Dinner Polling System
 
 class PollTimer {
-  constructor(endTime, elementId = "timerDisplay") {
+  // endTime is an absolute Date, so the countdown never drifts; root is the
+  // document holding the timer element (parent.document from a component iframe)
+  constructor(endTime, elementId = "timerDisplay", root = document) {
     this.endTime = endTime;
     this.elementId = elementId;
+    this.root = root;
     this.interval = null;
     this.isActive = true;
     this.callbacks = {
@@ -53,7 +56,7 @@ class PollTimer {
       .toString()
       .padStart(2, "0")}:${seconds.toString().padStart(2, "0")}`;
 
-    const element = document.getElementById(this.elementId);
+    const element = this.root.getElementById(this.elementId);
     if (element) {
       element.textContent = `Poll ends in ${formattedTime}`;
 
@@ -79,7 +82,7 @@ class PollTimer {
   handleTimerEnd() {
     this.stopTimer();
 
-    const element = document.getElementById(this.elementId);
+    const element = this.root.getElementById(this.elementId);
     if (element) {
       element.textContent = "Poll Ended";
       element.classList.add("timer-ended");
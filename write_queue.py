@@ -0,0 +1,245 @@
+"""Optional write-behind queue for poll submissions.
+
+With WRITE_QUEUE_ENABLED=1, submit_poll() acknowledges a submission as soon as
+it is appended to a local journal file, and a background thread writes queued
+submissions to the database every WRITE_QUEUE_INTERVAL_MS with one multi-row
+upsert. This turns the burst of commits just before the poll deadline into a
+few batched ones. The flusher also wakes exactly at the deadline and, once
+the queue is written, finalizes the day's summary. It drains the queue at
+interpreter exit and replays the journal on start-up, so a crash between
+acknowledgement and flush does not lose submissions.
+
+With the queue disabled, submit_poll() is database.submit_poll().
+"""
+import atexit
+import json
+import os
+import threading
+from datetime import datetime
+
+import pytz
+from sqlalchemy.exc import IntegrityError
+
+import database
+
+WRITE_QUEUE_ENABLED = os.getenv('WRITE_QUEUE_ENABLED', '0') == '1'
+WRITE_QUEUE_INTERVAL_MS = int(os.getenv('WRITE_QUEUE_INTERVAL_MS', '50'))
+WRITE_QUEUE_MAX_BATCH = int(os.getenv('WRITE_QUEUE_MAX_BATCH', '500'))
+WRITE_QUEUE_JOURNAL = os.getenv('WRITE_QUEUE_JOURNAL', 'write_queue.journal')
+
+
+class SubmissionQueue:
+    def __init__(self, journal_path=WRITE_QUEUE_JOURNAL, interval_ms=WRITE_QUEUE_INTERVAL_MS,
+                 max_batch=WRITE_QUEUE_MAX_BATCH):
+        self.journal_path = journal_path
+        self.interval = interval_ms / 1000
+        self.max_batch = max_batch
+        # {(user_id, date_str): sequence}; a dict so double-clicks collapse into one row.
+        # The sequence tells a flush whether the entry it wrote is still the current one
+        self._pending = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+        # Keys being written by the running flush; discard() waits for them
+        self._in_flight = set()
+        self._flushed = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._journal = None
+        self._replay_journal()
+        self._thread = threading.Thread(target=self._run, name='submission-flusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _replay_journal(self):
+        if self.journal_path and os.path.exists(self.journal_path):
+            with open(self.journal_path) as f:
+                for line in f:
+                    if line.strip():
+                        user_id, date_str = json.loads(line)
+                        self._sequence += 1
+                        self._pending[(user_id, date_str)] = self._sequence
+        if self.journal_path:
+            self._journal = open(self.journal_path, 'a')
+
+    def _append_journal(self, user_id, date_str):
+        if self._journal:
+            self._journal.write(json.dumps([user_id, date_str]) + '\n')
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+
+    def _rewrite_journal(self):
+        # Called with the lock held once a batch is in the database
+        if not self._journal:
+            return
+        self._journal.close()
+        tmp_path = self.journal_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for user_id, date_str in self._pending:
+                f.write(json.dumps([user_id, date_str]) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+        self._journal = open(self.journal_path, 'a')
+
+    def submit(self, user_id, date_str):
+        """Queue a submission; returns once it is journalled"""
+        date_str = str(date_str)
+        with self._lock:
+            if (user_id, date_str) not in self._pending:
+                self._sequence += 1
+                self._pending[(user_id, date_str)] = self._sequence
+                self._append_journal(user_id, date_str)
+            full = len(self._pending) >= self.max_batch
+        if full:
+            self._wake.set()
+
+    def discard(self, user_id, date_str):
+        """Drop a not-yet-written submission; True if one was pending.
+        If a flush is writing it right now, wait until that commits, so a
+        database delete that follows this call removes the written row."""
+        key = (user_id, str(date_str))
+        with self._lock:
+            while key in self._in_flight:
+                self._flushed.wait()
+            found = self._pending.pop(key, None) is not None
+            if found:
+                self._rewrite_journal()
+        return found
+
+    def discard_date(self, date_str):
+        """Drop every not-yet-written submission for date_str; returns how many.
+        Waits for a flush writing any of them, like discard()."""
+        date_str = str(date_str)
+        with self._lock:
+            while any(day == date_str for _, day in self._in_flight):
+                self._flushed.wait()
+            keys = [key for key in self._pending if key[1] == date_str]
+            for key in keys:
+                del self._pending[key]
+            if keys:
+                self._rewrite_journal()
+        return len(keys)
+
+    def pending_for(self, date_str):
+        """{user_id: True} for submissions on date_str still waiting to be written"""
+        date_str = str(date_str)
+        with self._lock:
+            return {user_id: True for user_id, day in self._pending if day == date_str}
+
+    def flush(self):
+        """Write everything queued so far in one batch; returns the number written"""
+        with self._flush_lock:
+            with self._lock:
+                batch = dict(self._pending)
+                self._in_flight = set(batch)
+            if not batch:
+                return 0
+            try:
+                try:
+                    database.submit_polls(list(batch))
+                except IntegrityError:
+                    # One bad row (e.g. a user removed meanwhile) must not block the rest
+                    for key in batch:
+                        try:
+                            database.submit_polls([key])
+                        except IntegrityError as e:
+                            print(f"Dropping queued submission {key}: {e}")
+                with self._lock:
+                    # Keep entries that were re-queued after this batch was taken
+                    for key, sequence in batch.items():
+                        if self._pending.get(key) == sequence:
+                            del self._pending[key]
+                    self._rewrite_journal()
+            finally:
+                with self._lock:
+                    self._in_flight = set()
+                    self._flushed.notify_all()
+            return len(batch)
+
+    def _seconds_until_deadline(self):
+        ist = pytz.timezone(database.IST_TZ)
+        now = datetime.now(ist)
+        deadline = ist.localize(datetime.combine(now.date(), database.get_poll_settings().deadline))
+        return (deadline - now).total_seconds()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            timeout = self.interval
+            try:
+                until_deadline = self._seconds_until_deadline()
+                if 0 < until_deadline < timeout:
+                    # Wake right at the deadline for the final flush
+                    timeout = until_deadline
+            except Exception:
+                pass
+            self._wake.wait(timeout)
+            self._wake.clear()
+            try:
+                self.flush()
+                # Everything acknowledged before the deadline is written; close the day
+                database.finalize_due_poll_day()
+            except Exception as e:
+                # Rows stay queued and journalled; retry on the next tick
+                print(f"Submission flush failed, will retry: {e}")
+
+    def close(self):
+        """Stop the flusher and write whatever is still queued"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                if self._journal:
+                    self._journal.close()
+                    self._journal = None
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """The process-wide queue, or None when WRITE_QUEUE_ENABLED is off"""
+    global _queue
+    if not WRITE_QUEUE_ENABLED:
+        return None
+    with _queue_lock:
+        if _queue is None:
+            _queue = SubmissionQueue(journal_path=WRITE_QUEUE_JOURNAL)
+    return _queue
+
+
+def submit_poll(user_id, date_str):
+    queue = get_queue()
+    if queue is None:
+        database.submit_poll(user_id, date_str)
+    else:
+        queue.submit(user_id, date_str)
+
+
+def pending_for(date_str):
+    queue = get_queue()
+    return queue.pending_for(date_str) if queue else {}
+
+
+def discard(user_id, date_str):
+    queue = get_queue()
+    return queue.discard(user_id, date_str) if queue else False
+
+
+def discard_date(date_str):
+    queue = get_queue()
+    return queue.discard_date(date_str) if queue else 0
+
+
+def finalize_due_poll_day():
+    """Write what is still queued, then finalize today if its deadline has passed"""
+    queue = get_queue()
+    if queue is not None:
+        queue.flush()
+    return database.finalize_due_poll_day()